@@ -0,0 +1,80 @@
+# -----------------------------------------------------------------------------
+# Stand-in for the "dbt" executable, used by run_benchmark.py so the pipeline
+# can be measured without a SQL Server.
+#
+# Step-by-step:
+# 1. Accepts the same "dbt run-operation <macro> --args <json> ..." command
+#    line that dbt_operation.run_operation builds.
+# 2. Optionally sleeps FAKE_DBT_STARTUP_SECONDS (environment variable) to
+#    mimic dbt's own startup, then logs "[QUERY_START] <epoch>" like the
+#    real macros do.
+# 3. The tables of the JSON file named by FAKE_DBT_LIVE_TABLES
+#    ({table: {column: {"dtype", "char_size"}}}) exist, every other table is
+#    missing. "create_table" logs "[SKIP]" for an existing table and
+#    "[CREATE]" otherwise; "create_tables_batch" logs a "[BATCH_RESULT]" line
+#    with SKIP/CREATE per table; "describe_tables" logs a "[DESCRIBE_RESULT]"
+#    line with the live columns; "inser_data" and "load_data_incremental"
+#    log a "[LOAD_RESULT]" line with the rows of the CSV file (newlines
+#    after the header). Every other macro just succeeds.
+#
+# Result:
+# - The Python side of every dbt call (subprocess, argument passing, result
+#   parsing) is exercised and timed; the database work is not.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import sys
+import time
+
+
+def _count_rows(file_path: str) -> int:
+
+    lines = 0
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+    return max(lines - 1, 0)
+
+
+def main(argv: list) -> int:
+
+    if len(argv) < 2 or argv[0] != "run-operation":
+        print(f"fake dbt: unsupported command: {' '.join(argv)}", file=sys.stderr)
+        return 2
+
+    macro = argv[1]
+    args = json.loads(argv[argv.index("--args") + 1]) if "--args" in argv else {}
+
+    time.sleep(float(os.environ.get("FAKE_DBT_STARTUP_SECONDS", "0")))
+    print("Running with dbt=fake")
+    print(f"[QUERY_START] {time.time()}")
+
+    live_tables = {}
+    if os.environ.get("FAKE_DBT_LIVE_TABLES"):
+        with open(os.environ["FAKE_DBT_LIVE_TABLES"], "r", encoding="utf-8") as f:
+            live_tables = json.load(f)
+
+    if macro == "create_table":
+        print(f"[SKIP] {args['table_name']}" if args.get("table_name") in live_tables else f"[CREATE] {args.get('table_name')}")
+    elif macro == "create_tables_batch":
+        tables = args.get("tables", {})
+        if isinstance(tables, str):
+            tables = json.loads(tables)
+        print("[BATCH_RESULT] " + json.dumps({
+            table_name: {"status": "SKIP" if table_name in live_tables else "CREATE", "message": ""}
+            for table_name in tables
+        }))
+    elif macro == "describe_tables":
+        tables = args.get("tables", [])
+        if isinstance(tables, str):
+            tables = json.loads(tables)
+        print("[DESCRIBE_RESULT] " + json.dumps({table_name: live_tables.get(table_name) for table_name in tables}))
+    elif macro in ("inser_data", "load_data_incremental"):
+        print("[LOAD_RESULT] " + json.dumps({"rows": _count_rows(args["file_path"])}))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
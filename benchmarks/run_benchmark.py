@@ -0,0 +1,377 @@
+# -----------------------------------------------------------------------------
+# Benchmark harness for the bootstrap pipeline (profiling, DDL and loading)
+# on synthetic data.
+#
+# Step-by-step:
+# 1. Synthetic datasets (generate_datasets): For every table in
+#    column_types.json whose source CSV exists under "datasets/", samples
+#    rows of the source file (with replacement) into a new CSV with the same
+#    header, so columns and value formats match the real schema. "--rows"
+#    sets the rows per table and "--tables" the number of tables (the
+#    sources are reused as <folder>_<file>_<n> when more tables than sources
+#    are requested).
+# 2. Fake dbt (_install_fake_dbt): Puts a "dbt" launcher for fake_dbt.py
+#    first on PATH, so every dbt run-operation is a real subprocess that
+#    does no database work.
+# 3. Pipeline (run_scale): In a scratch working directory, runs
+#    analyse_dataset and create_table (DDL, stg models and data load) with
+#    the "profiling", "batch_ddl", "max_workers", "validation" (output in
+#    the working directory) and "load_strategies" settings of
+#    main_config.json and the loader chosen with "--backend" (sqlite and
+#    duckdb load into a local stand-in warehouse; dbt only goes through the
+#    fake dbt).
+# 4. Report: Per stage (generate, profile, tables) the wall time, rows,
+#    rows/sec and the peak RSS of the process and of its child processes;
+#    the load totals and per-table metrics come from the metrics spans. Each
+#    scale runs in its own process, so the peak RSS of one scale does not
+#    leak into the next. A scale only succeeds when every table was loaded;
+#    the others are listed in "failed_tables".
+#
+# Result:
+# - One JSON file per invocation ("benchmarks/results/<run_id>.json" by
+#   default, log in "benchmarks/results/logs"; both untracked), ready to be
+#   compared between commits and data sizes, e.g.:
+#     python benchmarks/run_benchmark.py --rows 1000000 10000000 --tables 6 --backend sqlite
+# -----------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parent
+PIPELINE_DIR = REPO_ROOT / "scripts" / "start_dbt_project"
+sys.path.insert(0, str(PIPELINE_DIR))
+
+from create_table import create_table
+from data_profile import analyse_dataset
+from log import LogManager
+from metrics import MetricsRecorder, set_recorder, span
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MAIN_CONFIG_PATH = PIPELINE_DIR / "config" / "main_config.json"
+COLUMN_TYPES_PATH = PIPELINE_DIR / "config" / "column_types.json"
+COLUMN_TYPE_CONFIG_PATH = PIPELINE_DIR / "config" / "column_type_config.json"
+DATASETS_PATH = REPO_ROOT / "datasets"
+DEFAULT_RESULTS_PATH = BENCHMARK_DIR / "results"
+DEFAULT_LOG_PATH = DEFAULT_RESULTS_PATH / "logs"
+GENERATE_CHUNK_ROWS = 1000000
+SCHEMA = "bronze"
+
+
+def _find_source(table_name: str, datasets_path: Path) -> Path:
+    # Source files do not always follow the lowercase naming (e.g. erp/CUST_AZ12.csv).
+    folder, file_name = table_name.split("_", 1)
+    folder_path = datasets_path / folder
+    if not folder_path.is_dir():
+        return None
+    for candidate in folder_path.iterdir():
+        if candidate.suffix.lower() == ".csv" and candidate.stem.lower() == file_name:
+            return candidate
+    return None
+
+
+def generate_datasets(output_path: Path, column_types: dict, datasets_path: Path, rows: int, tables: int,
+                      seed: int = 0, chunk_rows: int = GENERATE_CHUNK_ROWS) -> dict:
+
+    sources = []
+    for table_name, columns in column_types.items():
+        source_path = _find_source(table_name, datasets_path)
+        if source_path is None:
+            continue
+        with open(source_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        header, body = lines[0], np.array([line for line in lines[1:] if line], dtype=object)
+        if [column.lower() for column in header.split(",")] != list(columns):
+            raise ValueError(f"Header of {source_path} does not match column_types.json for {table_name}.")
+        sources.append((table_name, header, body))
+
+    if not sources:
+        raise ValueError(f"No source CSV found under {datasets_path} for the tables of column_types.json.")
+
+    rng = np.random.default_rng(seed)
+    generated = {}
+    for index in range(tables):
+        source_name, header, body = sources[index % len(sources)]
+        copy = index // len(sources)
+        table_name = source_name if copy == 0 else f"{source_name}_{copy + 1}"
+        folder, file_name = table_name.split("_", 1)
+
+        file_path = output_path / folder / f"{file_name}.csv"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            f.write(header + "\n")
+            remaining = rows
+            while remaining > 0:
+                size = min(chunk_rows, remaining)
+                f.write("\n".join(body[rng.integers(0, len(body), size=size)]) + "\n")
+                remaining -= size
+
+        generated[table_name] = {"source": source_name, "rows": rows, "bytes": file_path.stat().st_size}
+
+    return generated
+
+
+def _peak_rss_mb() -> dict:
+    # High-water marks since the process started (ru_maxrss is in KB on Linux, bytes on macOS).
+    if resource is None:
+        return {"self": None, "children": None}
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+
+def _install_fake_dbt(bin_path: Path) -> None:
+
+    bin_path.mkdir(parents=True, exist_ok=True)
+    fake_dbt = BENCHMARK_DIR / "fake_dbt.py"
+    if os.name == "nt":
+        (bin_path / "dbt.cmd").write_text(f'@"{sys.executable}" "{fake_dbt}" %*\n', encoding="utf-8")
+    else:
+        launcher = bin_path / "dbt"
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake_dbt}" "$@"\n', encoding="utf-8")
+        launcher.chmod(0o755)
+    os.environ["PATH"] = str(bin_path) + os.pathsep + os.environ.get("PATH", "")
+
+
+def _stage_result(stage: dict, rows: int = None) -> dict:
+
+    rows = stage["rows"] if rows is None else rows
+    seconds = stage["wall_seconds"]
+    return {
+        "name": stage["name"],
+        "wall_seconds": seconds,
+        "rows": rows,
+        "rows_per_sec": round(rows / seconds, 2) if rows and seconds > 0 else None,
+        "bytes": stage["bytes"],
+        "status": stage["status"],
+        "peak_rss_mb": stage["attributes"].get("peak_rss_mb")
+    }
+
+
+def run_scale(rows: int, tables: int, backend: str, work_path: Path, seed: int, keep_data: bool, logger) -> dict:
+
+    with open(MAIN_CONFIG_PATH, "r", encoding="utf-8") as f:
+        main_config = json.load(f)
+    with open(COLUMN_TYPES_PATH, "r", encoding="utf-8") as f:
+        column_types = json.load(f)
+
+    recorder = MetricsRecorder(run_id=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{rows}")
+    set_recorder(recorder)
+
+    work_path.mkdir(parents=True, exist_ok=True)
+    os.chdir(work_path)
+    _install_fake_dbt(work_path / "bin")
+    Path("sqlcreator", "models", "staging", SCHEMA).mkdir(parents=True, exist_ok=True)
+
+    datasets_path = work_path / "datasets"
+    loader_config = dict(main_config.get("loader", {}), backend=backend)
+    loader_config["database_path"] = str(work_path / ("local_warehouse.duckdb" if backend == "duckdb" else "local_warehouse"))
+    # Validate and load the same way cli.py does; quarantined and clean files stay in the work directory.
+    validation = main_config.get("validation")
+    if validation:
+        validation = dict(validation, output_path=str(work_path / validation.get("output_path", "validated")))
+    stages = []
+    results = {}
+
+    logger.info(f"Benchmark scale: {rows} rows x {tables} table(s), backend={backend}, working directory={work_path}")
+    try:
+        with span("generate", "stage") as stage:
+            generated = generate_datasets(datasets_path, column_types, DATASETS_PATH, rows, tables, seed=seed)
+            stage["rows"] = sum(item["rows"] for item in generated.values())
+            stage["bytes"] = sum(item["bytes"] for item in generated.values())
+            stage["attributes"]["peak_rss_mb"] = _peak_rss_mb()
+        stages.append(_stage_result(stage))
+
+        with span("profile", "stage") as stage:
+            results["profile"] = analyse_dataset(
+                str(datasets_path), str(COLUMN_TYPE_CONFIG_PATH), logger=logger,
+                output_path=str(work_path / "column_types.json"), **main_config.get("profiling", {})
+            )
+            stage["rows"] = sum(item["rows"] or 0 for item in recorder.spans if item["parent_id"] == stage["id"])
+            stage["attributes"]["peak_rss_mb"] = _peak_rss_mb()
+        stages.append(_stage_result(stage))
+
+        with span("tables", "stage") as stage:
+            results["tables"] = create_table(
+                str(work_path / "column_types.json"), str(datasets_path), logger=logger, schema=SCHEMA,
+                database=main_config.get("database"), add_info=True, batch_ddl=main_config.get("batch_ddl", False),
+                max_workers=main_config.get("max_workers", 1), loader_config=loader_config, validation=validation,
+                load_strategies=main_config.get("load_strategies")
+            )
+            stage["attributes"]["peak_rss_mb"] = _peak_rss_mb()
+
+        load_spans = [item for item in recorder.spans if item["name"] == "load"]
+        loaded_rows = sum(item["rows"] or 0 for item in load_spans)
+        stages.append(_stage_result(stage, rows=loaded_rows or None))
+
+    finally:
+        os.chdir(REPO_ROOT)
+        if not keep_data:
+            shutil.rmtree(datasets_path, ignore_errors=True)
+
+    load_seconds = sum(item["wall_seconds"] for item in load_spans)
+    dbt_spans = [item for item in recorder.spans if item["name"].startswith("dbt:")]
+    load_tasks = {item["name"].split(":", 1)[1]: item for item in recorder.spans
+                  if item["kind"] == "task" and item["name"].startswith("load:")}
+    # A load task that never ran (e.g. blocked by a failed DDL) has no span.
+    failed_tables = [
+        {"table": table_name, "status": load_tasks[table_name]["status"] if table_name in load_tasks else "NOT_RUN"}
+        for table_name in generated if load_tasks.get(table_name, {}).get("status") != "OK"
+    ]
+
+    return {
+        "rows_per_table": rows,
+        "tables": tables,
+        "backend": backend,
+        "succeeded": all(results.values()) and not failed_tables,
+        "failed_tables": failed_tables,
+        "dataset": generated,
+        "stages": stages,
+        "load": {
+            "rows": loaded_rows,
+            "seconds": round(load_seconds, 6),
+            # Summed over tables, so this is the per-connection throughput.
+            "rows_per_sec": round(loaded_rows / load_seconds, 2) if loaded_rows and load_seconds > 0 else None
+        },
+        "dbt": {
+            "calls": len(dbt_spans),
+            "startup_seconds": round(sum(item["attributes"].get("dbt_startup_seconds") or 0 for item in dbt_spans), 6),
+            "query_seconds": round(sum(item["attributes"].get("dbt_query_seconds") or 0 for item in dbt_spans), 6)
+        },
+        "table_metrics": [
+            {
+                "table": table_name,
+                "wall_seconds": item["wall_seconds"],
+                "rows": next((child["rows"] for child in load_spans if child["parent_id"] == item["id"]), None),
+                "status": item["status"]
+            }
+            for table_name, item in load_tasks.items()
+        ]
+    }
+
+
+def _run_isolated(cli_args: argparse.Namespace, rows: int, work_path: Path) -> dict:
+    # One process per scale keeps the peak RSS of each scale independent.
+    with tempfile.TemporaryDirectory(prefix="dwh_benchmark_result_") as result_dir:
+        result_path = Path(result_dir) / "result.json"
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()),
+            "--rows", str(rows),
+            "--tables", str(cli_args.tables),
+            "--backend", cli_args.backend,
+            "--seed", str(cli_args.seed),
+            "--work-dir", str(work_path),
+            "--log-level", cli_args.log_level,
+            "--scale-output", str(result_path)
+        ]
+        if cli_args.keep_data:
+            cmd.append("--keep-data")
+
+        completed = subprocess.run(cmd)
+        if completed.returncode != 0 or not result_path.exists():
+            return {"rows_per_table": rows, "tables": cli_args.tables, "backend": cli_args.backend, "succeeded": False,
+                    "error": f"benchmark process exited with code {completed.returncode}"}
+        with open(result_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _environment() -> dict:
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profiling, DDL and loading on synthetic data.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000000], help="Rows per table; one run per value (e.g. 1000000 10000000 100000000).")
+    parser.add_argument("--tables", type=int, default=6, help="Number of tables (source schemas are reused when greater than the number of sources).")
+    parser.add_argument("--backend", choices=("sqlite", "duckdb", "dbt"), default="sqlite", help="Loader backend; 'dbt' only goes through the fake dbt.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the row sampling.")
+    parser.add_argument("--work-dir", help="Working directory (default: a temporary directory, removed at the end).")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<run_id>.json).")
+    parser.add_argument("--keep-data", action="store_true", help="Keep the generated CSV files.")
+    parser.add_argument("--log-level", default="INFO", help="Level of the benchmark log (benchmarks/results/logs).")
+    parser.add_argument("--scale-output", help=argparse.SUPPRESS)
+    cli_args = parser.parse_args()
+
+    log_manager = LogManager(subdirectory="benchmark", level=cli_args.log_level, async_logging=True,
+                             base_path=str(DEFAULT_LOG_PATH))
+    logger = log_manager.get_logger()
+
+    if cli_args.scale_output:
+        # Child process started by _run_isolated: a single scale.
+        try:
+            result = run_scale(cli_args.rows[0], cli_args.tables, cli_args.backend, Path(cli_args.work_dir),
+                               cli_args.seed, cli_args.keep_data, logger)
+            with open(cli_args.scale_output, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+        finally:
+            log_manager.flush_and_close()
+        return
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    work_root = Path(cli_args.work_dir) if cli_args.work_dir else Path(tempfile.mkdtemp(prefix="dwh_benchmark_"))
+    output_path = Path(cli_args.output) if cli_args.output else DEFAULT_RESULTS_PATH / f"{run_id}.json"
+
+    scales = []
+    try:
+        for rows in cli_args.rows:
+            start_time = time.time()
+            result = _run_isolated(cli_args, rows, work_root / f"rows_{rows}")
+            scales.append(result)
+            logger.info(f"Scale {rows} rows x {cli_args.tables} table(s) finished in {time.time() - start_time:.4f} seconds.")
+            for stage in result.get("stages", []):
+                print(f"{rows:>12} {stage['name']:<10} {stage['wall_seconds']:>10.3f}s "
+                      f"{stage['rows_per_sec'] or 0:>14.0f} rows/s  peak RSS {stage['peak_rss_mb']}")
+            for failed in result.get("failed_tables", []):
+                print(f"{rows:>12} FAILED     {failed['table']} ({failed['status']})")
+    finally:
+        if not cli_args.work_dir and not cli_args.keep_data:
+            shutil.rmtree(work_root, ignore_errors=True)
+
+    report = {
+        "run_id": run_id,
+        "environment": _environment(),
+        "parameters": {"rows": cli_args.rows, "tables": cli_args.tables, "backend": cli_args.backend, "seed": cli_args.seed},
+        "scales": scales
+    }
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    logger.info(f"Benchmark report saved to: {output_path}")
+    print(f"Benchmark report saved to: {output_path}")
+    log_manager.flush_and_close()
+    if not all(scale.get("succeeded") for scale in scales):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
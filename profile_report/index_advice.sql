@@ -0,0 +1,61 @@
+-- GENERATED FILE - do not edit. Rewritten by index_advisor.py from the profile reports on every
+-- run of the table step; review it before applying, or set indexes.apply to run it per table.
+
+-- crm_cust_info
+-- NONCLUSTERED: join column
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_cust_info') AND name = 'ix_crm_cust_info_cst_id')
+    CREATE NONCLUSTERED INDEX ix_crm_cust_info_cst_id ON bronze.crm_cust_info (cst_id)
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_cust_info') AND name = 'ix_crm_cust_info_cst_id' AND is_disabled = 1)
+    ALTER INDEX ix_crm_cust_info_cst_id ON bronze.crm_cust_info REBUILD;
+-- NONCLUSTERED: join column
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_cust_info') AND name = 'ix_crm_cust_info_cst_key')
+    CREATE NONCLUSTERED INDEX ix_crm_cust_info_cst_key ON bronze.crm_cust_info (cst_key)
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_cust_info') AND name = 'ix_crm_cust_info_cst_key' AND is_disabled = 1)
+    ALTER INDEX ix_crm_cust_info_cst_key ON bronze.crm_cust_info REBUILD;
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.crm_cust_info;
+
+-- crm_prd_info
+-- CLUSTERED: unique in profile
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_prd_info') AND type IN (1, 5))
+    CREATE CLUSTERED INDEX cix_crm_prd_info ON bronze.crm_prd_info (prd_id);
+-- NONCLUSTERED: join column
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_prd_info') AND name = 'ix_crm_prd_info_prd_key')
+    CREATE NONCLUSTERED INDEX ix_crm_prd_info_prd_key ON bronze.crm_prd_info (prd_key)
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_prd_info') AND name = 'ix_crm_prd_info_prd_key' AND is_disabled = 1)
+    ALTER INDEX ix_crm_prd_info_prd_key ON bronze.crm_prd_info REBUILD;
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.crm_prd_info;
+
+-- crm_sales_details
+-- CLUSTERED: merge key
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_sales_details') AND type IN (1, 5))
+    CREATE CLUSTERED INDEX cix_crm_sales_details ON bronze.crm_sales_details (sls_ord_num, sls_prd_key);
+-- NONCLUSTERED: join column
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_sales_details') AND name = 'ix_crm_sales_details_sls_cust_id')
+    CREATE NONCLUSTERED INDEX ix_crm_sales_details_sls_cust_id ON bronze.crm_sales_details (sls_cust_id)
+ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.crm_sales_details') AND name = 'ix_crm_sales_details_sls_cust_id' AND is_disabled = 1)
+    ALTER INDEX ix_crm_sales_details_sls_cust_id ON bronze.crm_sales_details REBUILD;
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.crm_sales_details;
+
+-- erp_cust_az12
+-- CLUSTERED: unique in profile
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.erp_cust_az12') AND type IN (1, 5))
+    CREATE CLUSTERED INDEX cix_erp_cust_az12 ON bronze.erp_cust_az12 (cid);
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.erp_cust_az12;
+
+-- erp_loc_a101
+-- CLUSTERED: unique in profile
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.erp_loc_a101') AND type IN (1, 5))
+    CREATE CLUSTERED INDEX cix_erp_loc_a101 ON bronze.erp_loc_a101 (cid);
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.erp_loc_a101;
+
+-- erp_px_cat_g1v2
+-- CLUSTERED: unique in profile
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('bronze.erp_px_cat_g1v2') AND type IN (1, 5))
+    CREATE CLUSTERED INDEX cix_erp_px_cat_g1v2 ON bronze.erp_px_cat_g1v2 (id);
+-- STATISTICS: refresh after load and index build
+UPDATE STATISTICS bronze.erp_px_cat_g1v2;
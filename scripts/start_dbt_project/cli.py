@@ -0,0 +1,327 @@
+# -----------------------------------------------------------------------------
+# Command line entry point of the bootstrap pipeline, with one subcommand per
+# step so an orchestrator can run (and retry) each step on its own:
+#
+#   python scripts/start_dbt_project/cli.py schemas   # dbt schemas + model folders
+#   python scripts/start_dbt_project/cli.py profile   # column_types.json + reports
+#   python scripts/start_dbt_project/cli.py ddl       # tables, stg models, sources YAML
+#   python scripts/start_dbt_project/cli.py load      # data load into existing tables
+#   python scripts/start_dbt_project/cli.py drift     # ALTER tables to column_types.json
+#                                                     # (--dry-run: report only)
+#   python scripts/start_dbt_project/cli.py all       # everything, as main.py does
+#
+# Step-by-step:
+# 1. Settings (_load_settings): Reads main_config.json ("--config", default:
+#    the file next to this script) and resolves every path in it (datasets,
+#    dbt project and profiles folders, schema/column type configurations,
+#    manifest, checkpoint, metrics, reports, validated files, local
+#    warehouse) against a root folder: "--root", else "root_dir" in the
+#    configuration, else the repository root. The command works from any
+#    working directory.
+#    "--project-dir", "--profiles-dir" and "--base-path" override the
+#    configuration.
+# 2. Lazy imports: Only the standard library and the small pipeline modules
+#    (logging, scheduler, manifest, metrics) are imported at startup. pandas
+#    and the profiler are imported by the "profile" step, PyYAML and the
+#    loaders by the table steps, so "schemas" or "load" do not pay for them.
+# 3. Tasks: Each subcommand adds its steps to a Scheduler (see scheduler.py)
+#    and runs it. "all" runs schemas and profile together, then the
+#    per-table DDL and load tasks (after the schema drift ALTERs, when
+#    enabled), and checkpoints completed tasks to
+#    "state_path" so a failed run resumes where it stopped ("--restart" to
+#    start over).
+# 4. Finalization: Logs the task and metrics summaries, exports the metrics
+#    and returns 0 on success, 1 otherwise.
+#
+# Result:
+# - Single steps start in a fraction of the time of the full pipeline, from
+#   any folder, with the same configuration file.
+# -----------------------------------------------------------------------------
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import dbt_operation
+from log import LogManager
+from manifest import DatasetManifest
+from metrics import MetricsRecorder, set_recorder
+from scheduler import Scheduler
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPT_DIR.parent.parent
+DEFAULT_CONFIG_PATH = SCRIPT_DIR / "config" / "main_config.json"
+DEFAULT_PATHS = {
+    "project_dir": "sqlcreator",
+    "schema_config_path": os.path.join("scripts", "start_dbt_project", "config", "schema.json"),
+    "column_type_config_path": os.path.join("scripts", "start_dbt_project", "config", "column_type_config.json"),
+    "column_types_path": os.path.join("scripts", "start_dbt_project", "config", "column_types.json"),
+    "manifest_path": os.path.join("scripts", "start_dbt_project", "state", "manifest.json"),
+    "state_path": os.path.join("scripts", "start_dbt_project", "state", "run_state.json"),
+    "metrics_path": "metrics"
+}
+COMMANDS = ("schemas", "profile", "ddl", "load", "drift", "all")
+
+
+def _resolve(root: Path, path: str) -> str:
+    return path if os.path.isabs(path) else str(root / path)
+
+
+def _read_config(config_path: str) -> dict:
+    with open(config_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_logging_config(config_path: str) -> dict:
+    # Read ahead of the rest of the configuration, so the logger is already set
+    # up as configured when the main configuration is loaded (and may fail).
+    try:
+        return _read_config(config_path).get('logging', {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _load_settings(cli_args: argparse.Namespace) -> dict:
+
+    config_path = os.path.abspath(cli_args.config)
+    main_config = _read_config(config_path)
+
+    if cli_args.root:
+        root = Path(cli_args.root).resolve()
+    elif main_config.get('root_dir'):
+        root = (Path(config_path).parent / main_config['root_dir']).resolve()
+    else:
+        root = REPO_ROOT
+
+    settings = {
+        "config_path": config_path,
+        "root": root,
+        "base_path": _resolve(root, cli_args.base_path or main_config['base_path']),
+        "raw_schema": main_config['raw_schema'],
+        "insert_info": main_config['insert_info'],
+        "database": main_config['database'],
+        "batch_ddl": main_config.get('batch_ddl', False),
+        "max_workers": main_config.get('max_workers', 1),
+        "hash_content": main_config.get('hash_content', False),
+        "profiling": dict(main_config.get('profiling', {})),
+        "load_strategies": main_config.get('load_strategies', {}),
+        "loader": dict(main_config.get('loader', {})),
+        "validation": dict(main_config.get('validation', {})),
+        "silver_models": dict(main_config.get('silver_models', {})),
+        "indexes": dict(main_config.get('indexes', {})),
+        "schema_drift": dict(main_config.get('schema_drift', {}))
+    }
+
+    for key, default in DEFAULT_PATHS.items():
+        settings[key] = _resolve(root, main_config.get(key, default))
+    if cli_args.project_dir:
+        settings["project_dir"] = os.path.abspath(cli_args.project_dir)
+
+    profiles_dir = cli_args.profiles_dir or main_config.get('profiles_dir')
+    settings["profiles_dir"] = _resolve(root, profiles_dir) if profiles_dir else os.path.join(settings["project_dir"], ".dbt")
+
+    if "report_path" in settings["profiling"]:
+        settings["profiling"]["report_path"] = _resolve(root, settings["profiling"]["report_path"])
+    if "database_path" in settings["loader"]:
+        settings["loader"]["database_path"] = _resolve(root, settings["loader"]["database_path"])
+    # Silver models and the index advisor read the profile reports written by the "profile" step.
+    for section in ("silver_models", "indexes"):
+        settings[section].setdefault("profile_path", settings["profiling"].get("report_path", "profile_report"))
+        settings[section]["profile_path"] = _resolve(root, settings[section]["profile_path"])
+    if "output_path" in settings["indexes"]:
+        settings["indexes"]["output_path"] = _resolve(root, settings["indexes"]["output_path"])
+    if "report_path" in settings["schema_drift"]:
+        settings["schema_drift"]["report_path"] = _resolve(root, settings["schema_drift"]["report_path"])
+    if "output_path" in settings["validation"]:
+        settings["validation"]["output_path"] = _resolve(root, settings["validation"]["output_path"])
+
+    return settings
+
+
+def _run_key(settings: dict) -> str:
+    # Fingerprint of the configuration: a checkpoint is only resumed with the same one.
+    digest = hashlib.sha256()
+    for file_path in (settings["config_path"], settings["schema_config_path"], settings["column_type_config_path"]):
+        with open(file_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _add_schemas(scheduler: Scheduler, settings: dict, logger) -> None:
+
+    def run_schemas() -> bool:
+        from create_schema_and_models import create_schema_and_models
+
+        logger.info(f"Starting creation of schemas and models from: {settings['schema_config_path']}")
+        return create_schema_and_models(settings["schema_config_path"], logger=logger)
+
+    scheduler.add("schemas", run_schemas)
+
+
+def _add_profile(scheduler: Scheduler, settings: dict, manifest: DatasetManifest, force: bool, logger) -> None:
+
+    def run_profile() -> bool:
+        from data_profile import analyse_dataset
+
+        logger.info(f"Starting dataset analysis (profiling) in: {settings['base_path']}")
+        errors = {}
+        succeeded = analyse_dataset(settings["base_path"], settings["column_type_config_path"], logger=logger,
+                                    output_path=settings["column_types_path"], manifest=manifest, force=force,
+                                    errors=errors, **settings["profiling"])
+        # A dataset that could not be profiled is left out of column_types.json, so only its own table
+        # gets no tasks; its failed "profile:<dataset>" task still makes the run fail.
+        for df_name, error in sorted(errors.items()):
+            task = scheduler.add(f"profile:{df_name}", lambda: False, depends_on=["profile"], checkpoint=False)
+            task.message = error
+        return succeeded
+
+    # Not checkpointed: the manifest already skips unchanged files, and a dataset that failed is retried.
+    scheduler.add("profile", run_profile, checkpoint=False)
+
+
+def _add_tables(scheduler: Scheduler, settings: dict, manifest: DatasetManifest, force: bool, logger,
+                create_tables: bool, add_info: bool, depends_on: list = None) -> None:
+
+    def plan_tables() -> bool:
+        from create_table import add_table_tasks
+
+        return add_table_tasks(scheduler, settings["column_types_path"], settings["base_path"], logger=logger,
+                               schema=settings["raw_schema"], database=settings["database"], add_info=add_info,
+                               batch_ddl=settings["batch_ddl"], manifest=manifest, force=force,
+                               load_strategies=settings["load_strategies"], loader_config=settings["loader"],
+                               depends_on=["plan_tables"], create_tables=create_tables,
+                               validation=settings["validation"], silver_models=settings["silver_models"],
+                               indexes=settings["indexes"], schema_drift=settings["schema_drift"])
+
+    # The table tasks are only known once column_types.json exists: plan_tables adds them.
+    scheduler.add("plan_tables", plan_tables, depends_on=depends_on, checkpoint=False)
+
+
+def _add_drift(scheduler: Scheduler, settings: dict, manifest: DatasetManifest, dry_run: bool, logger,
+               report: list) -> None:
+
+    def run_drift() -> bool:
+        from schema_drift import check_schema_drift
+
+        logger.info(f"Checking schema drift against: {settings['column_types_path']}")
+        with open(settings["column_types_path"], "r", encoding="utf-8") as f:
+            column_type = json.load(f)
+        outcome = check_schema_drift(column_type, settings["raw_schema"], logger, manifest=manifest, dry_run=dry_run,
+                                     report_path=settings["schema_drift"].get("report_path"),
+                                     allow_incompatible=settings["schema_drift"].get("allow_incompatible", False))
+        report.extend(outcome["report"])
+        if not dry_run:
+            manifest.save()
+        return outcome["status"] == "OK"
+
+    scheduler.add("schema_drift", run_drift)
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(description="Create schemas, profile datasets and create/load bronze tables.")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="Path of main_config.json.")
+    parser.add_argument("--root", help="Folder that relative paths of the configuration are resolved against (default: repository root).")
+    parser.add_argument("--project-dir", help="dbt project folder (default: 'project_dir' in the configuration, else sqlcreator).")
+    parser.add_argument("--profiles-dir", help="dbt profiles folder (default: 'profiles_dir' in the configuration, else <project-dir>/.dbt).")
+    parser.add_argument("--base-path", help="Datasets folder (default: 'base_path' in the configuration).")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("schemas", help="Create the schemas and the staging model folders.")
+    for command, help_text in (
+        ("profile", "Profile the datasets and write column_types.json."),
+        ("ddl", "Create the tables, their stg models and the sources YAML (no data load)."),
+        ("load", "Load the datasets into the existing tables."),
+        ("drift", "Alter the existing tables to the column types of column_types.json."),
+        ("all", "Run every step, resuming from the checkpoint of a failed run.")
+    ):
+        subparser = subparsers.add_parser(command, help=help_text)
+        if command == "drift":
+            subparser.add_argument("--dry-run", action="store_true", help="Only print the planned ALTER statements.")
+            continue
+        if command != "ddl":
+            subparser.add_argument("--force", action="store_true", help="Ignore the dataset manifest (and the checkpoint) and profile/load every file again.")
+        if command == "all":
+            subparser.add_argument("--restart", action="store_true", help="Ignore the checkpoint of a failed run and start from the beginning.")
+
+    return parser
+
+
+def main(argv: list = None) -> int:
+
+    cli_args = build_parser().parse_args(argv)
+    force = getattr(cli_args, "force", False)
+
+    log_manager = LogManager(subdirectory='start_project', **_load_logging_config(cli_args.config))
+    logger = log_manager.get_logger()
+    recorder = MetricsRecorder()
+    set_recorder(recorder)
+
+    logger.info(f"--- STARTING '{cli_args.command}' ---")
+    bach_start_time = time.time()
+
+    try:
+        settings = _load_settings(cli_args)
+        run_key = _run_key(settings) if cli_args.command == "all" else None
+    except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+        logger.error(f"FATAL: Failed to load or decode custom configuration file {cli_args.config}: {e}", exc_info=True)
+        log_manager.flush_and_close()
+        return 1
+
+    dbt_operation.configure(settings["project_dir"], settings["profiles_dir"])
+    manifest = DatasetManifest(settings["manifest_path"], hash_content=settings["hash_content"])
+
+    # Only "all" is checkpointed: single steps are cheap to rerun and are retried by the caller.
+    checkpoint = cli_args.command == "all"
+    scheduler = Scheduler(logger, state_path=settings["state_path"] if checkpoint else None, run_key=run_key,
+                          max_workers=settings["max_workers"],
+                          resume=not (getattr(cli_args, "restart", False) or force))
+
+    if cli_args.command in ("schemas", "all"):
+        _add_schemas(scheduler, settings, logger)
+    if cli_args.command in ("profile", "all"):
+        _add_profile(scheduler, settings, manifest, force, logger)
+    if cli_args.command == "ddl":
+        _add_tables(scheduler, settings, manifest, force, logger, create_tables=True, add_info=False)
+    elif cli_args.command == "load":
+        _add_tables(scheduler, settings, manifest, force, logger, create_tables=False, add_info=True)
+    elif cli_args.command == "drift":
+        drift_report = []
+        dry_run = cli_args.dry_run or settings["schema_drift"].get("dry_run", False)
+        _add_drift(scheduler, settings, manifest, dry_run, logger, drift_report)
+    elif cli_args.command == "all":
+        _add_tables(scheduler, settings, manifest, force, logger, create_tables=True, add_info=settings["insert_info"],
+                    depends_on=["schemas", "profile"])
+
+    succeeded = scheduler.run()
+    if cli_args.command == "drift":
+        print("\n".join(drift_report))
+
+    logger.info("Task summary:")
+    for line in scheduler.summary_lines():
+        logger.info(f"  {line}")
+
+    bach_end_time = time.time()
+    bach_duration = bach_end_time-bach_start_time
+    logger.info(f"--- '{cli_args.command}' CONCLUDED IN {bach_duration:.4f} SECONDS ({'SUCCESS' if succeeded else 'FAILURE'}) ---")
+
+    try:
+        logger.info("Run metrics:")
+        for line in recorder.summary_lines():
+            logger.info(f"  {line}")
+        logger.info(f"Metrics exported to: {recorder.export_jsonl(settings['metrics_path'])}")
+    except OSError as e:
+        logger.error(f"Failed to export run metrics to {settings['metrics_path']}: {e}", exc_info=True)
+
+    log_manager.flush_and_close()
+    return 0 if succeeded else 1
+
+
+# The guard keeps process-pool workers (profiling) from re-running the command
+# when they import this module on platforms that spawn processes.
+if __name__ == "__main__":
+    sys.exit(main())
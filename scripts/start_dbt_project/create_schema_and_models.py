@@ -1,9 +1,9 @@
 from pathlib import Path
 from logging import Logger
-import subprocess
-import os
 import json
 
+from dbt_operation import models_path, run_operation
+
 def create_schema_and_models(file_path_config: str, logger: Logger) -> bool:
     
     logger.info(f"Loading schema list from: {file_path_config}")
@@ -11,19 +11,7 @@ def create_schema_and_models(file_path_config: str, logger: Logger) -> bool:
         with open(file_path_config, "r", encoding="utf-8") as f:
             schema_list = json.load(f)
         
-        args_json = json.dumps(schema_list)
-
-        cmd = [
-            "dbt",
-            "run-operation", "create_multiple_schemas",
-            "--args", args_json,
-            "--profiles-dir", "./sqlcreator/.dbt",
-            "--project-dir", "./sqlcreator"
-        ]
-        
-        logger.debug(f"Executing DBT command: {' '.join(cmd)}")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run_operation("create_multiple_schemas", schema_list, logger)
 
         if result.returncode != 0:
             logger.error("Failed to execute DBT operation 'create_multiple_schemas'.")
@@ -34,7 +22,7 @@ def create_schema_and_models(file_path_config: str, logger: Logger) -> bool:
         logger.info("DBT operation 'create_multiple_schemas' completed successfully.")
         logger.debug(f"DBT Output: {result.stdout.strip()}")
 
-        dbt_models_path = os.path.join("sqlcreator", "models", "staging")
+        dbt_models_path = models_path("staging")
         
         for schema in schema_list["schema_list"]:
             folder_path = Path(dbt_models_path) / schema
@@ -1,162 +1,447 @@
-
-
-
-
-import json
-import os
-from pathlib import Path
-import subprocess
-
 import json
 import os
-import subprocess
+import time
+from functools import partial
 from pathlib import Path
 from logging import Logger
 
 import yaml
 
-def create_table(file_path_data_config: str, file_path_datasets: str, logger: Logger, schema: str, database: str, add_info: bool = False) -> bool:
-    
-    logger.info(f"Starting table creation and data loading using config: {file_path_data_config}")
-    tables = []
+import metrics
+from dbt_operation import models_path, run_operation, parse_result_marker
+from index_advisor import advise_indexes, apply_indexes, disable_indexes, write_index_script
+from load_strategy import get_load_strategy
+from loaders import BaseLoader, get_loader
+from manifest import DatasetManifest
+from scheduler import Scheduler
+from schema_drift import check_schema_drift
+from silver_models import read_profile, write_silver_models
+from validation import validate_csv
+
+BATCH_MAX_ARGS_CHARS = 24000
+
+
+def _split_batches(column_type: dict, max_chars: int = BATCH_MAX_ARGS_CHARS) -> list:
+    # Keeps each "--args" payload below the command line limits of the OS.
+    batches = []
+    current = {}
+    current_size = 0
+    for table_name, columns in column_type.items():
+        size = len(json.dumps({table_name: columns}))
+        if current and current_size + size > max_chars:
+            batches.append(current)
+            current = {}
+            current_size = 0
+        current[table_name] = columns
+        current_size += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def create_tables_batch(column_type: dict, schema: str, logger: Logger) -> dict:
+
+    statuses = {}
+    for batch in _split_batches(column_type):
+        logger.info(f"Executing batched DDL for {len(batch)} table(s).")
+        result = run_operation("create_tables_batch", {"schema": schema, "tables": batch}, logger)
+        batch_result = parse_result_marker(result.stdout, "[BATCH_RESULT]")
+
+        if result.returncode != 0 or batch_result is None:
+            logger.error("FAILURE: DBT create_tables_batch failed.")
+            logger.error(f"STDOUT: {result.stdout.strip()}")
+            logger.error(f"STDERR: {result.stderr.strip()}")
+            for table_name in batch:
+                statuses[table_name] = {"status": "ERROR", "message": "create_tables_batch failed"}
+            continue
+
+        for table_name in batch:
+            statuses[table_name] = batch_result.get(table_name, {"status": "ERROR", "message": "missing from batch result"})
+
+    return statuses
+
+
+def _create_single_table(table_name: str, columns: dict, schema: str, logger: Logger) -> dict:
+
+    args_create = {
+        "schema": schema,
+        "table_name": table_name,
+        "columns": columns
+    }
+
+    logger.debug(f"Executing DDL for table {table_name}.")
+    result_create = run_operation("create_table", args_create, logger)
+
+    if result_create.returncode != 0:
+        logger.error(f"FAILURE: DBT create_table failed for {table_name}.")
+        logger.error(f"STDOUT: {result_create.stdout.strip()}")
+        logger.error(f"STDERR: {result_create.stderr.strip()}")
+        return {"status": "ERROR", "message": "create_table failed"}
+
+    # The macro logs "[SKIP]" and creates nothing when the table already exists.
+    if "[SKIP]" in result_create.stdout:
+        return {"status": "SKIP", "message": ""}
+    return {"status": "CREATE", "message": ""}
+
+
+def _write_stg_model(table_name: str, schema: str, dbt_stg_path: str, logger: Logger) -> None:
+
+    sql_file_path = Path(dbt_stg_path) / Path(f"stg_{table_name}.sql")
+
+    sql_content = (
+        f"SELECT\n"
+        f"    *\n"
+        f"FROM {{{{ source('{schema}', '{table_name}') }}}}\n"
+    )
+
+    with open(sql_file_path, "w", encoding="utf-8") as f:
+        f.write(sql_content)
+
+    logger.info(f"STG model created: {sql_file_path}")
+
+
+def _load_table(table_name: str, columns: dict, file_path_datasets: str, schema: str, logger: Logger,
+                loader: BaseLoader, load_strategy: dict = None, manifest: DatasetManifest = None, force: bool = False,
+                validation: dict = None, before_load=None) -> str:
+    # before_load, if given, runs right before the rows are loaded (not for a skipped load);
+    # the load fails when it returns False.
+
     try:
-        try:
-            with open(file_path_data_config, "r", encoding="utf-8") as f:
-                column_type = json.load(f)
+        folder, csv_file = table_name.split("_", 1)
+        csv_path = Path(file_path_datasets) / folder / f"{csv_file}.csv"
 
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logger.error(f"Failed to load or decode configuration file {file_path_data_config}: {e}", exc_info=True)
-            return False
-            
-        
-        for key, item in column_type.items():
-            table_name = key
-                        
-            args_create = {
-                "schema": schema,
-                "table_name": table_name,
-                "columns": item
+    except ValueError:
+        logger.error(f"Skipping data load for {table_name}: Invalid key format (expected folder_filename).")
+        return "SKIPPED"
+
+    if not csv_path.exists():
+        logger.warning(f"CSV file not found, skipping data load for {table_name}: {csv_path}")
+        return "SKIPPED"
+
+    if manifest is not None and not force and not manifest.needs_load(table_name, str(csv_path)):
+        logger.info(f"Dataset unchanged since last successful load, skipping data load for {table_name}.")
+        return "UNCHANGED"
+
+    # The manifest keeps the fingerprint of the source file; the loader reads the clean copy.
+    load_path = csv_path
+    if validation and validation.get("enabled"):
+        report = validate_csv(table_name, str(csv_path), columns, logger,
+                              output_path=validation.get("output_path", "validated"),
+                              max_reject_ratio=validation.get("max_reject_ratio", 1.0))
+        if report["status"] == "REJECTED":
+            if manifest is not None:
+                manifest.record_load(table_name, str(csv_path), "FAILED")
+            return "FAILED"
+        load_path = Path(report["clean_path"])
+
+    if before_load is not None and not before_load():
+        if manifest is not None:
+            manifest.record_load(table_name, str(csv_path), "FAILED")
+        return "FAILED"
+
+    with metrics.span("load", "operation", backend=type(loader).__name__) as load_span:
+        outcome = loader.load(table_name, str(load_path), schema, columns, load_strategy)
+        load_span["rows"] = outcome["rows"]
+        load_span["bytes"] = load_path.stat().st_size
+        load_span["status"] = "OK" if outcome["status"] == "SUCCESS" else outcome["status"]
+    status = outcome["status"]
+
+    if status == "SUCCESS":
+        throughput = f" ({outcome['rows']} rows, {outcome['rows_per_sec']:.0f} rows/sec)" if outcome["rows_per_sec"] else ""
+        logger.info(f"SUCCESS: Data loaded into {table_name} in {outcome['seconds']:.4f} seconds{throughput}.")
+
+    if manifest is not None:
+        manifest.record_load(table_name, str(csv_path), status)
+
+    return status
+
+
+def _create_table_and_model(table_name: str, columns: dict, ddl_status: dict, schema: str, dbt_stg_path: str,
+                            logger: Logger) -> dict:
+
+    if ddl_status is None:
+        with metrics.span("ddl", "operation"):
+            ddl_status = _create_single_table(table_name, columns, schema, logger)
+
+    if ddl_status["status"] not in ("CREATE", "SKIP"):
+        logger.error(f"FAILURE: Table {table_name} could not be created: {ddl_status['message']}")
+        return ddl_status
+
+    logger.info(f"SUCCESS: Table {table_name} created successfully.")
+
+    with metrics.span("stg_write", "operation"):
+        _write_stg_model(table_name, schema, dbt_stg_path, logger)
+
+    return ddl_status
+
+
+def _write_sources_yml(column_type: dict, table_names: list, schema: str, database: str, dbt_stg_path: str,
+                       logger: Logger) -> None:
+
+    tables = []
+    for table_name in table_names:
+        table_entry = {
+            "name": table_name,
+            "description": f"Tabela origem {schema}.{table_name}",
+            "columns": []
+        }
+
+        for col_name in column_type[table_name].keys():
+            col_entry = {
+                "name": col_name,
+                "description": ""
             }
-            
-            cmd_create = [
-                "dbt",
-                "run-operation", "create_table",
-                "--args", json.dumps(args_create),
-                "--profiles-dir", "./sqlcreator/.dbt",
-                "--project-dir", "./sqlcreator"
-            ]
-            
-            logger.debug(f"Executing DDL for table {table_name}.")
-            result_create = subprocess.run(cmd_create, capture_output=True, text=True)
-
-            if result_create.returncode != 0:
-                logger.error(f"FAILURE: DBT create_table failed for {table_name}.")
-                logger.error(f"STDOUT: {result_create.stdout.strip()}")
-                logger.error(f"STDERR: {result_create.stderr.strip()}")
-                continue
-            
-            logger.info(f"SUCCESS: Table {table_name} created successfully.")
-
-            
-            dbt_stg_path = os.path.join("sqlcreator", "models", "staging", schema)
-            sql_file_path = Path(dbt_stg_path) / Path(f"stg_{table_name}.sql")
-
-            sql_content = (
-                f"SELECT\n"
-                f"    *\n"
-                f"FROM {{{{ source('{schema}', '{table_name}') }}}}\n"
-            )
-
-            
-            with open(sql_file_path, "w", encoding="utf-8") as f:
-                f.write(sql_content)
-
-            logger.info(f"STG model created: {sql_file_path}")
-
-            table_entry = {
-                "name": table_name,
-                "description": f"Tabela origem {schema}.{table_name}",
-                "columns": []
+
+            table_entry["columns"].append(col_entry)
+
+        tables.append(table_entry)
+
+    sources_yml = {
+        "sources": [
+            {
+                "name": schema,
+                "database": database,
+                "schema": schema,
+                "tables": tables
             }
+        ]
+    }
+
+
+    yml_path = Path(dbt_stg_path) / f"_src_{schema}.yml"
+
+    with open(yml_path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(
+            sources_yml,
+            f,
+            sort_keys=False,
+            allow_unicode=True
+        )
+
+    logger.info(f"YAML file created: {yml_path}")      
+
+    dbt_models_path =Path(models_path("marts"))
+    dbt_models_path.mkdir(parents=True, exist_ok=True)
+
+    logger.info(f"Marts file created: {yml_path}") 
+
+
+def _write_silver(column_type: dict, table_names: list, strategies: dict, silver_models: dict, logger: Logger) -> None:
+
+    if not silver_models or not silver_models.get("enabled"):
+        return
+    write_silver_models(column_type, table_names, strategies, models_path("marts"), logger,
+                        profile_path=silver_models.get("profile_path"), prefix=silver_models.get("prefix", "slv_"),
+                        unique_keys=silver_models.get("unique_keys"), watermarks=silver_models.get("watermarks"))
+
+
+def _advise_indexes(column_type: dict, strategies: dict, schema: str, indexes: dict, logger: Logger) -> dict:
+    # {table_name: advice} from the profile reports; empty when the advisor is disabled.
+
+    if not indexes or not indexes.get("enabled"):
+        return {}
+    advice_by_table = {
+        table_name: advise_indexes(table_name, columns, read_profile(indexes.get("profile_path"), table_name), schema,
+                                   indexes, strategies[table_name])
+        for table_name, columns in column_type.items()
+    }
+    write_index_script(advice_by_table, indexes.get("output_path", os.path.join("profile_report", "index_advice.sql")), logger)
+    return advice_by_table
+
+
+def _run_schema_drift(column_type: dict, schema: str, logger: Logger, manifest: DatasetManifest,
+                      schema_drift: dict, blocked: set) -> bool:
+    # Existing tables are altered to the new column types before any table is created or loaded.
+    # Tables with incompatible changes are added to "blocked": their table and load tasks fail.
+
+    outcome = check_schema_drift(column_type, schema, logger, manifest=manifest, dry_run=schema_drift.get("dry_run", False),
+                                 report_path=schema_drift.get("report_path"),
+                                 allow_incompatible=schema_drift.get("allow_incompatible", False))
+    blocked.update(outcome["incompatible"])
+    return outcome["status"] != "FAILED"
+
+
+def _log_table_summary(results: list, logger: Logger) -> None:
+
+    logger.info("Table processing summary:")
+    for result in results:
+        logger.info(
+            f"  {result['table']}: ddl={result['ddl']} stg={'OK' if result['stg'] else 'NO'} "
+            f"load={result['load']} ({result['duration']:.4f}s)"
+        )
 
-            for col_name in item.keys():
-                col_entry = {
-                    "name": col_name,
-                    "description": ""
-                }
-
-                table_entry["columns"].append(col_entry)
-
-            tables.append(table_entry)
-
-            if add_info:
-                try:
-                    folder, csv_file = table_name.split("_", 1)
-                    csv_path = Path(file_path_datasets) / folder / f"{csv_file}.csv"
-                    
-                except ValueError:
-                    logger.error(f"Skipping data load for {table_name}: Invalid key format (expected folder_filename).")
-                    continue
-
-                if not csv_path.exists():
-                    logger.warning(f"CSV file not found, skipping data load for {table_name}: {csv_path}")
-                    continue
-
-                insert_args = {
-                    "file_path": str(csv_path.resolve()),
-                    "table_path": f"{schema}.{table_name}"
-                }
-
-                insert_cmd = [
-                    "dbt", "run-operation", "inser_data",
-                    "--args", json.dumps(insert_args),
-                    "--profiles-dir", "./sqlcreator/.dbt",
-                    "--project-dir", "./sqlcreator"
-                ]
-                
-                logger.debug(f"Executing DML (insert data) for table {table_name}.")
-                insert_result = subprocess.run(insert_cmd, capture_output=True, text=True)
-
-                if insert_result.returncode != 0:
-                    logger.error(f"FAILURE: DBT inser_data failed for {table_name}.")
-                    logger.error(f"STDOUT: {insert_result.stdout.strip()}")
-                    logger.error(f"STDERR: {insert_result.stderr.strip()}")
-                else:
-                    logger.info(f"SUCCESS: Data loaded into {table_name}.")
-
-        sources_yml = {
-            "sources": [
-                {
-                    "name": schema,
-                    "database": database,
-                    "schema": schema,
-                    "tables": tables
-                }
-            ]
-        }
 
+def _load_table_config(file_path_data_config: str, logger: Logger, add_info: bool, load_strategies: dict,
+                       loader_config: dict) -> tuple:
+    # Returns (column_type, strategies, loader), or None if the configuration is invalid.
 
-        yml_path = Path(dbt_stg_path) / f"_src_{schema}.yml"
+    try:
+        with open(file_path_data_config, "r", encoding="utf-8") as f:
+            column_type = json.load(f)
+
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error(f"Failed to load or decode configuration file {file_path_data_config}: {e}", exc_info=True)
+        return None
 
-        with open(yml_path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(
-                sources_yml,
-                f,
-                sort_keys=False,
-                allow_unicode=True
-            )
+    try:
+        strategies = {table_name: get_load_strategy(load_strategies, table_name) for table_name in column_type}
+    except ValueError as e:
+        logger.error(f"Invalid load_strategies configuration: {e}")
+        return None
 
-        logger.info(f"YAML file created: {yml_path}")      
+    try:
+        loader = get_loader(loader_config, logger) if add_info else None
+    except ValueError as e:
+        logger.error(f"Invalid loader configuration: {e}")
+        return None
 
-        dbt_models_path =Path(os.path.join("sqlcreator", "models", "marts"))
-        dbt_models_path.mkdir(parents=True, exist_ok=True)
+    return column_type, strategies, loader
 
-        logger.info(f"Marts file created: {yml_path}") 
 
-    except Exception as e:
-        logger.error(f"An unexpected error occurred during table processing: {e}", exc_info=True)
+def create_table(file_path_data_config: str, file_path_datasets: str, logger: Logger, schema: str, database: str,
+                 add_info: bool = False, batch_ddl: bool = False, max_workers: int = 1,
+                 manifest: DatasetManifest = None, force: bool = False, load_strategies: dict = None,
+                 loader_config: dict = None, validation: dict = None, silver_models: dict = None,
+                 indexes: dict = None, schema_drift: dict = None) -> bool:
+    # Runs the tasks of add_table_tasks on a scheduler of its own (without checkpoint), for callers outside
+    # the pipeline DAG such as the benchmark. Returns False if any table task failed or was blocked.
+
+    scheduler = Scheduler(logger, max_workers=max_workers)
+    if not add_table_tasks(scheduler, file_path_data_config, file_path_datasets, logger, schema, database,
+                           add_info=add_info, batch_ddl=batch_ddl, manifest=manifest, force=force,
+                           load_strategies=load_strategies, loader_config=loader_config, validation=validation,
+                           silver_models=silver_models, indexes=indexes, schema_drift=schema_drift):
         return False
-        
-    return True
+    return scheduler.run()
+
+
+def add_table_tasks(scheduler: Scheduler, file_path_data_config: str, file_path_datasets: str, logger: Logger,
+                    schema: str, database: str, add_info: bool = False, batch_ddl: bool = False,
+                    manifest: DatasetManifest = None, force: bool = False, load_strategies: dict = None,
+                    loader_config: dict = None, depends_on: list = None, create_tables: bool = True,
+                    validation: dict = None, silver_models: dict = None, indexes: dict = None,
+                    schema_drift: dict = None) -> bool:
+    # Registers the table work as scheduler tasks: "table:<name>" (DDL + stg model) and
+    # "load:<name>" per table, so each load starts as soon as its own table exists, and a final
+    # "finish_tables" task (sources YAML, summary) that runs whatever the outcome of the tables.
+    # With create_tables=False only the loads are added (the tables must already exist).
+
+    logger.info(f"Planning table creation and data loading using config: {file_path_data_config}")
+    table_config = _load_table_config(file_path_data_config, logger, add_info, load_strategies, loader_config)
+    if table_config is None:
+        return False
+    column_type, strategies, loader = table_config
+    advice_by_table = _advise_indexes(column_type, strategies, schema, indexes, logger)
+    apply_index_advice = bool(add_info and indexes and indexes.get("apply"))
+
+    dbt_stg_path = models_path("staging", schema)
+    ddl_statuses = {}
+    drift_blocked_tables = set()
+    results = {
+        table_name: {"table": table_name, "ddl": None, "stg": False, "load": "DISABLED" if not add_info else None,
+                     "message": "", "duration": 0.0}
+        for table_name in column_type
+    }
+
+    def drift_blocked(table_name: str) -> bool:
+        if table_name not in drift_blocked_tables:
+            return False
+        logger.error(f"FAILURE: {table_name} is not created or loaded: its schema drift is incompatible with the live "
+                     f"table (rebuild it, or set schema_drift.allow_incompatible).")
+        results[table_name]["message"] = "incompatible schema drift"
+        return True
 
-        
+    def run_ddl_batch() -> bool:
+        # Tables restored from a checkpoint already exist: only the others are sent to dbt.
+        pending = {table_name: columns for table_name, columns in column_type.items()
+                   if scheduler.tasks[f"table:{table_name}"].status == "PENDING"}
+        if pending:
+            ddl_statuses.update(create_tables_batch(pending, schema, logger))
+        return True
+
+    def run_table(table_name: str) -> bool:
+        if drift_blocked(table_name):
+            return False
+        start_time = time.time()
+        ddl_status = _create_table_and_model(table_name, column_type[table_name], ddl_statuses.get(table_name), schema,
+                                             dbt_stg_path, logger)
+        result = results[table_name]
+        result["ddl"] = ddl_status["status"]
+        result["message"] = ddl_status["message"]
+        result["stg"] = ddl_status["status"] in ("CREATE", "SKIP")
+        if ddl_status["status"] == "CREATE" and manifest is not None:
+            manifest.record_applied_schema(table_name, column_type[table_name])
+        result["duration"] += time.time() - start_time
+        return result["stg"]
+
+    def run_load(table_name: str) -> bool:
+        # Also checked here: a table task restored from a checkpoint does not run again.
+        if drift_blocked(table_name):
+            results[table_name]["load"] = "FAILED"
+            return False
+        start_time = time.time()
+        result = results[table_name]
+        # A freshly created table is empty, whatever the manifest says.
+        force_load = force or result["ddl"] == "CREATE"
+        before_load = None
+        if apply_index_advice and strategies[table_name]["strategy"] == "full":
+            # A full reload rewrites every row: the index task rebuilds the disabled indexes afterwards.
+            before_load = partial(disable_indexes, table_name, advice_by_table.get(table_name), schema, logger)
+        result["load"] = _load_table(table_name, column_type[table_name], file_path_datasets, schema, logger,
+                                     loader=loader, load_strategy=strategies[table_name], manifest=manifest, force=force_load,
+                                     validation=validation, before_load=before_load)
+        if manifest is not None:
+            manifest.save()
+        result["duration"] += time.time() - start_time
+        return result["load"] != "FAILED"
+
+    def run_indexes(table_name: str) -> bool:
+        return apply_indexes(table_name, advice_by_table[table_name], logger)
+
+    def finish_tables() -> bool:
+        if loader is not None:
+            loader.close()
+
+        if manifest is not None:
+            manifest.save()
+
+        for table_name, result in results.items():
+            if create_tables and scheduler.tasks[f"table:{table_name}"].status == "RESTORED":
+                result["ddl"], result["stg"] = "RESTORED", True
+            if add_info and scheduler.tasks[f"load:{table_name}"].status == "RESTORED":
+                result["load"] = "RESTORED"
+
+        _log_table_summary(list(results.values()), logger)
+        if create_tables:
+            table_names = [table_name for table_name, result in results.items() if result["stg"]]
+            _write_sources_yml(column_type, table_names, schema, database, dbt_stg_path, logger)
+            _write_silver(column_type, table_names, strategies, silver_models, logger)
+        return True
+
+    table_dependencies = list(depends_on or [])
+    if create_tables and schema_drift and schema_drift.get("enabled"):
+        scheduler.add("schema_drift", partial(_run_schema_drift, column_type, schema, logger, manifest, schema_drift,
+                                              drift_blocked_tables),
+                      depends_on=table_dependencies, checkpoint=False)
+        table_dependencies = ["schema_drift"]
+    if create_tables and batch_ddl:
+        scheduler.add("ddl_batch", run_ddl_batch, depends_on=table_dependencies, checkpoint=False)
+        table_dependencies = ["ddl_batch"]
+
+    final_dependencies = []
+    for table_name in column_type:
+        load_dependencies = table_dependencies
+        if create_tables:
+            scheduler.add(f"table:{table_name}", partial(run_table, table_name), depends_on=table_dependencies)
+            final_dependencies.append(f"table:{table_name}")
+            load_dependencies = [f"table:{table_name}"]
+        if add_info:
+            scheduler.add(f"load:{table_name}", partial(run_load, table_name), depends_on=load_dependencies)
+            final_dependencies.append(f"load:{table_name}")
+        if apply_index_advice and advice_by_table.get(table_name):
+            # After the load, so rows are bulk inserted into a heap.
+            scheduler.add(f"index:{table_name}", partial(run_indexes, table_name), depends_on=[f"load:{table_name}"])
+            final_dependencies.append(f"index:{table_name}")
+
+    scheduler.add("finish_tables", finish_tables, depends_on=final_dependencies, trigger="all_done", checkpoint=False)
+    return True
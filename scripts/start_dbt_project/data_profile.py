@@ -7,39 +7,151 @@
 # 1. Loads a JSON configuration file ("column_type_config.json") that defines
 #    desired SQL or standardized data types for specific column names or
 #    Pandas dtypes.
-# 2. Recursively walks through every subfolder under "datasets/".
-# 3. For each CSV file found:
+# 2. Recursively walks through every subfolder under "datasets/" and sorts
+#    the CSV files found, so the output order is stable.
+# 3. For each CSV file found (on a process pool when "parallel" is enabled,
+#    with "spawn" workers so no lock held by another thread is copied into
+#    them; workers return small schema dicts, and a failing file is
+#    reported without aborting the others):
 #      - Builds a lowercase, underscore-separated name for the dataset.
-#      - Reads the file into a pandas DataFrame.
-#      - Converts all column names to lowercase and builds a dictionary of
-#        {column_name: detected_dtype}.
-#      - Compares each column and its type with the configuration file:
-#          * If the column name or dtype matches a key in column_type_config,
-#            its mapped type is applied to the output dictionary.
+#      - If a DatasetManifest is given and the file fingerprint (and the
+#        mapping rules) did not change since the last run, reuses the stored
+#        schema and skips reading the file.
+#      - Streams the file in chunks (bounded by "sample_rows" unless
+#        "full_scan" is enabled) and accumulates per-column statistics
+#        (merged dtype, min/max, max length, date-like values), so memory
+#        stays flat whatever the file size.
+#      - Converts all column names to lowercase and resolves the SQL type of
+#        each column with type_inference.resolve_column_type:
+#          * exact name > name pattern > inference from the statistics
+#            (DATE, right-sized integers and strings) > dtype fallback.
+#          * Integers and strings are only right-sized when the whole file
+#            was scanned ("full_scan", or a file shorter than "sample_rows");
+#            otherwise they keep the dtype type. The profile report records
+#            this ("types_from_full_scan") and the type chosen per column.
 #      - Stores the mapped types in the "dataframes" dictionary.
-#      - Generates an HTML profiling report using ydata_profiling and saves it
-#        to "./profile_report/analysis_html/".
+#      - In the same pass, profiles every column (nulls, min/max, approximate
+#        distinct count, top values, max length; see profiler.py) and writes
+#        "./profile_report/<dataset>.json", plus an HTML summary in
+#        "./profile_report/analysis_html/" when "html_report" is enabled.
+#      - Records a metrics span per file (wall time measured in the worker,
+#        rows scanned, bytes on disk).
 # 4. After processing all CSVs, writes the complete dictionary of inferred and
 #    standardized column types to:
 #       "./sqlcreator/macros/config/column_types.json"
 #    This file can later be used by dbt macros to dynamically create tables
-#    or apply schema definitions.
+#    or apply schema definitions. Datasets that could not be profiled are
+#    left out of it; with an "errors" dict they are reported there and the
+#    call still succeeds, so the caller can skip only those tables.
 #
 # Result:
-# - An HTML profiling report per dataset (for data quality and exploration).
+# - A JSON (and optional HTML) profiling report per dataset (for data quality
+#   and exploration).
 # - A JSON file summarizing column names and standardized types, ready for
 #   integration with dbt or SQL schema generation workflows.
 # -----------------------------------------------------------------------------
 
+import hashlib
 import json
+import multiprocessing
 import pandas as pd
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from logging import Logger
-from ydata_profiling import ProfileReport
 
-def analyse_dataset(base_path: str, file_path_config: str, logger: Logger, output_path: str) -> bool:
+from manifest import DatasetManifest
+from metrics import get_recorder
+from profiler import ColumnProfile, build_profile, write_profile_report
+from type_inference import load_rules, resolve_column_type
+
+DEFAULT_SAMPLE_ROWS = 100000
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_REPORT_PATH = "profile_report"
+
+
+def _scan_file(file_path: str, sample_rows: int = DEFAULT_SAMPLE_ROWS, chunk_size: int = DEFAULT_CHUNK_SIZE, full_scan: bool = False) -> tuple:
+
+    column_profiles = {}
+    nrows = None if full_scan else sample_rows
+
+    with pd.read_csv(file_path, chunksize=chunk_size, nrows=nrows) as reader:
+        for chunk in reader:
+            for col in chunk.columns:
+                column_profiles.setdefault(col.lower(), ColumnProfile()).update(chunk[col])
+
+    if not column_profiles:
+        # Header-only files produce no chunks; their columns stay without statistics.
+        header = pd.read_csv(file_path, nrows=0)
+        column_profiles = {col.lower(): ColumnProfile() for col in header.columns}
+
+    column_stats = {column: profile.stats for column, profile in column_profiles.items()}
+    rows = max(profile.stats.count for profile in column_profiles.values()) if column_profiles else 0
+    sampled = nrows is not None and rows >= nrows
+
+    return column_stats, build_profile(column_profiles, sampled=sampled)
+
+
+def _rules_key(column_type: dict, sample_rows: int, full_scan: bool) -> str:
+    rules = json.dumps({"rules": column_type, "sample_rows": sample_rows, "full_scan": full_scan}, sort_keys=True)
+    return hashlib.sha256(rules.encode("utf-8")).hexdigest()
+
+
+def _map_column_types(column_stats: dict, rules: dict, complete: bool = True) -> tuple:
+
+    df_dtypes = {}
+    reasons = {}
+    mappings = []
+    for column, stats in column_stats.items():
+        new_type, reason = resolve_column_type(column, stats, rules, complete=complete)
+        mappings.append(f"Mapped column '{column}' based on {reason} to type '{new_type}'.")
+        df_dtypes[column] = new_type
+        reasons[column] = reason
+
+    return df_dtypes, reasons, mappings
+
+
+def _profile_file(df_name: str, file_path: str, rules: dict, sample_rows: int, chunk_size: int, full_scan: bool) -> dict:
+    # Runs in a worker process: returns only small, picklable results.
+    start_time = time.time()
+    try:
+        column_stats, profile = _scan_file(file_path, sample_rows=sample_rows, chunk_size=chunk_size, full_scan=full_scan)
+        # Integer and string widths are only right-sized when every row was scanned.
+        profile["types_from_full_scan"] = not profile["sampled"]
+        schema, reasons, mappings = _map_column_types(column_stats, rules, complete=not profile["sampled"])
+        for column, column_profile in profile["columns"].items():
+            column_profile["sql_type"] = schema.get(column)
+            column_profile["type_reason"] = reasons.get(column)
+        return {"name": df_name, "file": file_path, "schema": schema, "profile": profile, "mappings": mappings, "error": None,
+                "seconds": time.time() - start_time, "bytes": os.path.getsize(file_path)}
+    except Exception as e:
+        return {"name": df_name, "file": file_path, "schema": None, "profile": None, "mappings": [], "error": f"{type(e).__name__}: {e}",
+                "seconds": time.time() - start_time, "bytes": None}
+
+
+def _list_datasets(base_path: str) -> list:
+
+    datasets = []
+    for root, _, files in os.walk(base_path):
+        for file in files:
+            if file.lower().endswith(".csv"):
+                file_path = os.path.join(root, file)
+                relative_path = os.path.relpath(file_path, base_path)
+                df_name = (relative_path.replace("\\", "/").replace("/", "_").replace(".csv", "")).lower()
+                datasets.append((df_name, file_path))
+
+    return sorted(datasets)
+
+
+def analyse_dataset(base_path: str, file_path_config: str, logger: Logger, output_path: str,
+                    sample_rows: int = DEFAULT_SAMPLE_ROWS, chunk_size: int = DEFAULT_CHUNK_SIZE, full_scan: bool = False,
+                    manifest: DatasetManifest = None, force: bool = False, parallel: bool = False, max_workers: int = None,
+                    report: bool = True, report_path: str = DEFAULT_REPORT_PATH, html_report: bool = False,
+                    errors: dict = None) -> bool:
     
     dataframes = {}
+    collect_errors = errors is not None
+    errors = {} if errors is None else errors
 
     logger.info(f"Loading custom column type configuration from: {file_path_config}")
     try:
@@ -50,47 +162,77 @@ def analyse_dataset(base_path: str, file_path_config: str, logger: Logger, outpu
             logger.error(f"FATAL: Failed to load or decode custom configuration file {file_path_config}: {e}", exc_info=True)
             return False
 
+        rules = load_rules(column_type)
+        rules_key = _rules_key(rules, sample_rows, full_scan)
+
         logger.info(f"Starting recursive scan and analysis in directory: {base_path}")
 
-        for root, _, files in os.walk(base_path):
-            for file in files:
-                if file.lower().endswith(".csv"):
-                    file_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(file_path, base_path)
-                    df_name = (relative_path.replace("\\", "/").replace("/", "_").replace(".csv", "")).lower()
-                    
-                    logger.info(f"Processing dataset: {df_name} from {file_path}")
-
-                    df = pd.read_csv(file_path)
-
-                    df_dtypes = {col.lower(): dtype for col, dtype in df.dtypes.to_dict().items()}
-
-                    for col, new_type in column_type.items():
-                        for column in df_dtypes.keys():
-                            if col in column:
-                                logger.debug(f"Mapped column '{column}' based on name match '{col}' to type '{new_type}'.")
-                                df_dtypes[column] = new_type
-                            elif col in str(df_dtypes[column]):
-                                logger.debug(f"Mapped column '{column}' based on dtype match '{col}' to type '{new_type}'.")
-                                df_dtypes[column] = new_type
-
-                    dataframes[df_name] = df_dtypes      
-
-                    # profile = ProfileReport(df, title="Profiling Report")
-                    # report_path = (f"./profile_report/analysis_html/{df_name}.html")
-                    # profile.to_file(report_path)
-                    # logger.debug(f"Profiling report generated at: {report_path}")
-        
+        pending = []
+        for df_name, file_path in _list_datasets(base_path):
+            if manifest is not None and not force:
+                cached_schema = manifest.cached_schema(df_name, file_path, rules_key)
+                if cached_schema is not None:
+                    logger.info(f"Dataset unchanged, reusing cached schema: {df_name}")
+                    dataframes[df_name] = cached_schema
+                    continue
+
+            logger.info(f"Processing dataset: {df_name} from {file_path}")
+            pending.append((df_name, file_path, rules, sample_rows, chunk_size, full_scan))
+
+        if parallel and len(pending) > 1:
+            logger.info(f"Profiling {len(pending)} dataset(s) on a process pool (max_workers={max_workers or os.cpu_count()}).")
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = list(executor.map(_profile_file, *zip(*pending)))
+        else:
+            results = [_profile_file(*args) for args in pending]
+
+        recorder = get_recorder()
+        for result in results:
+            recorder.record_span(
+                result["name"], "operation", result["seconds"],
+                rows=result["profile"]["rows"] if result["profile"] else None, bytes_read=result["bytes"],
+                status="OK" if result["error"] is None else "ERROR", file=result["file"]
+            )
+
+            if result["error"] is not None:
+                logger.error(f"FAILURE: Could not profile dataset {result['name']} ({result['file']}): {result['error']}")
+                errors[result["name"]] = result["error"]
+                continue
+
+            for mapping in result["mappings"]:
+                logger.debug(mapping)
+
+            dataframes[result["name"]] = result["schema"]
+
+            if manifest is not None:
+                manifest.record_profile(result["name"], result["file"], result["schema"], rules_key)
+
+            if report:
+                try:
+                    json_path = write_profile_report(result["name"], result["profile"], report_path, html_report=html_report)
+                    logger.debug(f"Profiling report generated at: {json_path}")
+                except OSError as e:
+                    logger.warning(f"Could not write profiling report for {result['name']}: {e}")
+
+        if manifest is not None:
+            manifest.save()
+
+        dataframes = {df_name: dataframes[df_name] for df_name in sorted(dataframes)}
+
         try:
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
             with open(output_path, "w", encoding="utf-8") as f:
                 json.dump(dataframes, f, indent=4, ensure_ascii=False)
             logger.info(f"SUCCESS: Final column type configuration saved to: {output_path}")
-            return True
         except Exception as e:
             logger.error(f"FATAL: Failed to write final configuration file to {output_path}: {e}", exc_info=True)
             return False
+
+        if errors:
+            logger.error(f"{len(errors)} dataset(s) could not be profiled: {', '.join(sorted(errors))}")
+            return collect_errors
+        return True
         
     except Exception as e:
         logger.error(f"An unexpected error occurred during dataset scanning/profiling: {e}", exc_info=True)
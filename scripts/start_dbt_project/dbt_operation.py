@@ -0,0 +1,87 @@
+# -----------------------------------------------------------------------------
+# Small helpers shared by every step that talks to dbt through
+# "dbt run-operation".
+#
+# Step-by-step:
+# 1. run_operation: Builds the dbt command for a macro and its JSON arguments,
+#    pointing at the project and profiles folders, and runs it as a subprocess.
+#    Each call is recorded as a metrics span. Macros log "[QUERY_START]
+#    <epoch>" right before their first query, which splits the wall time into
+#    dbt startup (process start, project parsing, adapter loading) and query
+#    time.
+# 2. configure / models_path: The dbt project and profiles folders default to
+#    "./sqlcreator" and "./sqlcreator/.dbt" (relative to the repo root) and
+#    can be set once by the CLI, so every step resolves the same folders.
+# 3. parse_result_marker: Macros that need to hand structured data back to
+#    Python log a single line starting with a marker (e.g. "[BATCH_RESULT]")
+#    followed by JSON. This function finds the last (or, with first=True,
+#    the first) such line in the dbt output and decodes it.
+#
+# Result:
+# - One place to build dbt commands, so batching, timing and path handling
+#   can evolve without touching every caller.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import subprocess
+import time
+from logging import Logger
+
+import metrics
+
+DBT_PROJECT_DIR = "./sqlcreator"
+DBT_PROFILES_DIR = "./sqlcreator/.dbt"
+
+
+def configure(project_dir: str, profiles_dir: str = None) -> None:
+    global DBT_PROJECT_DIR, DBT_PROFILES_DIR
+    DBT_PROJECT_DIR = project_dir
+    DBT_PROFILES_DIR = profiles_dir or os.path.join(project_dir, ".dbt")
+
+
+def models_path(*parts: str) -> str:
+    return os.path.normpath(os.path.join(DBT_PROJECT_DIR, "models", *parts))
+
+
+def run_operation(macro: str, args: dict, logger: Logger) -> subprocess.CompletedProcess:
+
+    cmd = [
+        "dbt",
+        "run-operation", macro,
+        "--args", json.dumps(args),
+        "--profiles-dir", DBT_PROFILES_DIR,
+        "--project-dir", DBT_PROJECT_DIR
+    ]
+
+    logger.debug(f"Executing DBT operation '{macro}'.")
+    with metrics.span(f"dbt:{macro}", "operation") as dbt_span:
+        start_time = time.time()
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        end_time = time.time()
+
+        query_start = parse_result_marker(result.stdout, "[QUERY_START]", first=True)
+        if isinstance(query_start, (int, float)) and start_time <= query_start <= end_time:
+            dbt_span["attributes"]["dbt_startup_seconds"] = round(query_start - start_time, 6)
+            dbt_span["attributes"]["dbt_query_seconds"] = round(end_time - query_start, 6)
+        else:
+            dbt_span["attributes"]["dbt_startup_seconds"] = round(end_time - start_time, 6)
+            dbt_span["attributes"]["dbt_query_seconds"] = None
+        dbt_span["attributes"]["returncode"] = result.returncode
+        if result.returncode != 0:
+            dbt_span["status"] = "ERROR"
+
+    return result
+
+
+def parse_result_marker(output: str, marker: str, first: bool = False):
+
+    lines = output.splitlines()
+    for line in (lines if first else reversed(lines)):
+        position = line.find(marker)
+        if position != -1:
+            try:
+                return json.loads(line[position + len(marker):].strip())
+            except json.JSONDecodeError:
+                return None
+    return None
@@ -0,0 +1,200 @@
+# -----------------------------------------------------------------------------
+# Index advisor: suggests (and optionally creates) SQL Server indexes for the
+# bronze tables from the cardinality and uniqueness measured by profiling,
+# instead of leaving every table as a heap.
+#
+# Step-by-step:
+# 1. Join columns: id-like columns (see silver_models.ID_NAME_PATTERNS) with
+#    at least "join_min_distinct" distinct values; low-cardinality flags are
+#    left alone.
+# 2. advise_indexes: Picks one layout per table:
+#      - Fact-like tables (at least "columnstore_min_rows" rows, 1M by
+#        default: below that a columnstore has too few full rowgroups to pay
+#        off, and "fact_min_join_columns" non-unique join columns, e.g. a
+#        full-size crm_sales_details) get a CLUSTERED COLUMNSTORE index:
+#        compressed segments and batch-mode scans/joins.
+#      - Other tables get a rowstore CLUSTERED index on their unique key
+#        (the merge key of load_strategies, else the first exactly unique
+#        column of the profile, see silver_models.is_exactly_unique). With
+#        "unique" (off by default) it is UNIQUE when the profile saw every
+#        value once: one profiled file does not prove later loads keep the
+#        key unique, and a duplicate would fail the index build. Tables
+#        without such a key stay heaps.
+#      - Rowstore tables also get a NONCLUSTERED index per other join column.
+#        disable_indexes turns these off before a full reload and the index
+#        statement rebuilds them afterwards, so the bulk load does not
+#        maintain them row by row.
+#    Columns typed (N)VARCHAR(MAX) cannot be index keys and are skipped.
+#    "update_statistics" appends an UPDATE STATISTICS per table.
+# 3. Statements: Every CREATE is guarded by a sys.indexes lookup, so they
+#    can run after every load; a table that already has a clustered index
+#    keeps it, and a disabled nonclustered index is rebuilt.
+# 4. write_index_script / apply_indexes: The suggestions of every table are
+#    written to "output_path" (a SQL script to review). With "apply"
+#    enabled, create_table runs them per table through the run_statements
+#    macro after the table was loaded, so the bulk load itself still goes
+#    into a heap.
+#
+# Result:
+# - Joins on cst_id / sls_cust_id / prd_key use indexes, and the large
+#   fact table is stored as a columnstore.
+# -----------------------------------------------------------------------------
+
+import os
+import re
+from logging import Logger
+
+from dbt_operation import run_operation
+from silver_models import detect_unique_key, is_exactly_unique, is_id_name, unique_columns
+
+DEFAULT_COLUMNSTORE_MIN_ROWS = 1000000
+DEFAULT_FACT_MIN_JOIN_COLUMNS = 2
+DEFAULT_JOIN_MIN_DISTINCT = 10
+MAX_TYPE_PATTERN = re.compile(r"\(\s*MAX\s*\)", re.IGNORECASE)
+
+
+def _indexable(sql_type: str) -> bool:
+    return not MAX_TYPE_PATTERN.search(sql_type) and sql_type.strip().upper() not in ("TEXT", "NTEXT", "IMAGE")
+
+
+def _join_columns(columns: dict, profile: dict, min_distinct: int) -> list:
+    column_profiles = profile.get("columns", {})
+    return [
+        column for column, sql_type in columns.items()
+        if is_id_name(column) and _indexable(sql_type)
+        and column_profiles.get(column, {}).get("approx_distinct", 0) >= min_distinct
+    ]
+
+
+def _guarded(table_path: str, condition: str, statement: str) -> str:
+    return (f"IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_path}') AND {condition})\n"
+            f"    {statement}")
+
+
+def advise_indexes(table_name: str, columns: dict, profile: dict, schema: str, config: dict = None,
+                   load_strategy: dict = None) -> list:
+    # Returns [{"kind", "name", "columns", "reason", "statement"}]; empty without a profile.
+
+    config = config or {}
+    if not profile.get("columns"):
+        return []
+
+    table_path = f"{schema}.{table_name}"
+    rows = profile.get("rows", 0)
+    unique = unique_columns(columns, profile)
+    join_columns = _join_columns(columns, profile, config.get("join_min_distinct", DEFAULT_JOIN_MIN_DISTINCT))
+    foreign_keys = [column for column in join_columns if column not in unique]
+
+    advice = []
+    if (rows >= config.get("columnstore_min_rows", DEFAULT_COLUMNSTORE_MIN_ROWS)
+            and len(foreign_keys) >= config.get("fact_min_join_columns", DEFAULT_FACT_MIN_JOIN_COLUMNS)):
+        name = f"cci_{table_name}"
+        advice.append({
+            "kind": "CLUSTERED COLUMNSTORE",
+            "name": name,
+            "columns": [],
+            "reason": f"fact-like: {rows} rows, join columns {', '.join(foreign_keys)}",
+            "statement": _guarded(table_path, "type IN (1, 5)",
+                                  f"CREATE CLUSTERED COLUMNSTORE INDEX {name} ON {table_path}")
+        })
+    else:
+        key = [column for column in detect_unique_key(table_name, columns, profile, load_strategy) if _indexable(columns[column])]
+        if key:
+            is_unique = len(key) == 1 and is_exactly_unique(key[0], profile)
+            kind = "UNIQUE CLUSTERED" if is_unique and config.get("unique", False) else "CLUSTERED"
+            name = f"cix_{table_name}"
+            reason = "unique in profile" if is_unique else "merge key"
+            advice.append({
+                "kind": kind,
+                "name": name,
+                "columns": key,
+                "reason": reason,
+                "statement": _guarded(table_path, "type IN (1, 5)",
+                                      f"CREATE {kind} INDEX {name} ON {table_path} ({', '.join(key)})")
+            })
+
+        for column in join_columns:
+            if column in key:
+                continue
+            name = f"ix_{table_name}_{column}"
+            advice.append({
+                "kind": "NONCLUSTERED",
+                "name": name,
+                "columns": [column],
+                "reason": "join column",
+                "statement": (_guarded(table_path, f"name = '{name}'",
+                                       f"CREATE NONCLUSTERED INDEX {name} ON {table_path} ({column})")
+                              + f"\nELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_path}') "
+                                f"AND name = '{name}' AND is_disabled = 1)\n    ALTER INDEX {name} ON {table_path} REBUILD")
+            })
+
+    if advice and config.get("update_statistics", True):
+        advice.append({
+            "kind": "STATISTICS",
+            "name": None,
+            "columns": [],
+            "reason": "refresh after load and index build",
+            "statement": f"UPDATE STATISTICS {table_path}"
+        })
+    return advice
+
+
+def write_index_script(advice_by_table: dict, output_path: str, logger: Logger) -> str:
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("-- GENERATED FILE - do not edit. Rewritten by index_advisor.py from the profile reports on every\n"
+                "-- run of the table step; review it before applying, or set indexes.apply to run it per table.\n")
+        for table_name, advice in advice_by_table.items():
+            f.write(f"\n-- {table_name}\n")
+            if not advice:
+                f.write("-- no suggestion (no profile report)\n")
+            for item in advice:
+                f.write(f"-- {item['kind']}: {item['reason']}\n{item['statement']};\n")
+
+    logger.info(f"Index suggestions written to: {output_path}")
+    return output_path
+
+
+def disable_indexes(table_name: str, advice: list, schema: str, logger: Logger) -> bool:
+    # Before a full reload: the NONCLUSTERED indexes of the advice that exist are disabled; the
+    # statements of apply_indexes rebuild them once the table is loaded.
+
+    table_path = f"{schema}.{table_name}"
+    statements = [
+        f"IF EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{table_path}') "
+        f"AND name = '{item['name']}' AND is_disabled = 0)\n    ALTER INDEX {item['name']} ON {table_path} DISABLE"
+        for item in advice or [] if item["kind"] == "NONCLUSTERED"
+    ]
+    if not statements:
+        return True
+
+    result = run_operation("run_statements", {"statements": statements}, logger)
+    if result.returncode != 0:
+        logger.error(f"FAILURE: Nonclustered indexes of {table_name} could not be disabled before the load.")
+        logger.error(f"STDOUT: {result.stdout.strip()}")
+        logger.error(f"STDERR: {result.stderr.strip()}")
+        return False
+
+    logger.info(f"Nonclustered indexes of {table_name} disabled for the full reload.")
+    return True
+
+
+def apply_indexes(table_name: str, advice: list, logger: Logger) -> bool:
+
+    if not advice:
+        return True
+
+    result = run_operation("run_statements", {"statements": [item["statement"] for item in advice]}, logger)
+    if result.returncode != 0:
+        logger.error(f"FAILURE: Index creation failed for {table_name}.")
+        logger.error(f"STDOUT: {result.stdout.strip()}")
+        logger.error(f"STDERR: {result.stderr.strip()}")
+        return False
+
+    created = ", ".join(f"{item['kind']} {item['name']}" for item in advice if item["name"])
+    logger.info(f"SUCCESS: Indexes applied to {table_name}: {created}.")
+    return True
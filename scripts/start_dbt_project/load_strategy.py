@@ -0,0 +1,96 @@
+# -----------------------------------------------------------------------------
+# Load strategies for the bronze tables.
+#
+# Every table is loaded with one of three strategies, configured per table in
+# the "load_strategies" section of main_config.json:
+#   - full:   the table is emptied and the whole CSV is loaded again (default).
+#   - append: only rows whose watermark column is at or after the current
+#             maximum in the table (or NULL) and that are not already in it
+#             are inserted, so late rows for the last day and rows without a
+#             watermark still arrive; identical rows are inserted once,
+#             e.g. {"strategy": "append", "watermark": "sls_order_dt"}.
+#   - merge:  rows are matched by key; new and changed rows are written, rows
+#             identical to the ones already loaded are left untouched,
+#             e.g. {"strategy": "merge", "key": ["sls_ord_num", "sls_prd_key"]}.
+#
+# Step-by-step:
+# 1. get_load_strategy: Reads and validates the strategy of a table.
+# 2. build_delta_statements: The CSV is first loaded into a stage table with
+#    the same columns as the target. This function returns the SQL statements
+#    that move the new/changed rows from the stage into the target. Only
+#    portable SQL is used (INSERT ... SELECT, EXCEPT, correlated EXISTS), so
+#    the same statements run on SQL Server and on SQLite/DuckDB stand-ins.
+# 3. apply_load_strategy: Runs those statements in one transaction on any
+#    DB-API connection (used by local warehouses and tests).
+#
+# Result:
+# - Load cost of append-mostly sources follows the new rows instead of the
+#   total history.
+# -----------------------------------------------------------------------------
+
+VALID_STRATEGIES = ("full", "append", "merge")
+
+
+def get_load_strategy(load_strategies: dict, table_name: str) -> dict:
+
+    strategy = dict((load_strategies or {}).get(table_name, {"strategy": "full"}))
+    strategy.setdefault("strategy", "full")
+
+    if strategy["strategy"] not in VALID_STRATEGIES:
+        raise ValueError(f"Invalid load strategy '{strategy['strategy']}' for {table_name}. Expected one of {VALID_STRATEGIES}.")
+
+    if strategy["strategy"] == "append" and not strategy.get("watermark"):
+        raise ValueError(f"Load strategy 'append' for {table_name} requires a 'watermark' column.")
+
+    if strategy["strategy"] == "merge":
+        key = strategy.get("key")
+        if isinstance(key, str):
+            strategy["key"] = [key]
+        if not strategy.get("key"):
+            raise ValueError(f"Load strategy 'merge' for {table_name} requires a 'key' column list.")
+
+    return strategy
+
+
+def build_delta_statements(strategy: dict, table_path: str, stage_path: str, columns: list) -> list:
+
+    column_list = ", ".join(columns)
+    table_name = table_path.split(".")[-1]
+
+    if strategy["strategy"] == "full":
+        return [
+            f"DELETE FROM {table_path}",
+            f"INSERT INTO {table_path} ({column_list}) SELECT {column_list} FROM {stage_path}"
+        ]
+
+    if strategy["strategy"] == "append":
+        watermark = strategy["watermark"]
+        # Only the rows at or after the watermark (or NULL) are compared, not the whole history.
+        recent = f"{watermark} >= (SELECT MAX({watermark}) FROM {table_path}) OR {watermark} IS NULL"
+        return [
+            f"INSERT INTO {table_path} ({column_list}) "
+            f"SELECT {column_list} FROM {stage_path} "
+            f"WHERE {recent} OR NOT EXISTS (SELECT 1 FROM {table_path}) "
+            f"EXCEPT SELECT {column_list} FROM {table_path} WHERE {recent}"
+        ]
+
+    key_match = " AND ".join(f"delta.{key} = {table_name}.{key}" for key in strategy["key"])
+    changed_rows = f"SELECT {column_list} FROM {stage_path} EXCEPT SELECT {column_list} FROM {table_path}"
+    return [
+        f"DELETE FROM {table_path} WHERE EXISTS (SELECT 1 FROM ({changed_rows}) delta WHERE {key_match})",
+        f"INSERT INTO {table_path} ({column_list}) {changed_rows}"
+    ]
+
+
+def apply_load_strategy(connection, strategy: dict, table_path: str, stage_path: str, columns: list) -> None:
+
+    cursor = connection.cursor()
+    try:
+        for statement in build_delta_statements(strategy, table_path, stage_path, columns):
+            cursor.execute(statement)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -0,0 +1,557 @@
+# -----------------------------------------------------------------------------
+# Pluggable loaders that move a CSV file into a bronze table.
+#
+# The backend is chosen in the "loader" section of main_config.json:
+#   - "dbt":     BULK INSERT through "dbt run-operation" (inser_data or
+#                load_data_incremental). The SQL Server must see the file path.
+#                The macros log the rows read from the file as "[LOAD_RESULT]".
+#   - "pyodbc":  streams the CSV from the client machine in batches through a
+#                pooled pyodbc connection using fast_executemany.
+#   - "sqlite":  local stand-in warehouse (one SQLite file per schema), used to
+#                measure throughput and test the load strategies.
+#   - "duckdb":  local stand-in warehouse in a single DuckDB file.
+#
+# Step-by-step (DB-API backends):
+# 1. ConnectionPool: Keeps up to "pool_size" open connections, shared by the
+#    worker threads of create_table.
+# 2. _read_batches: Streams the CSV with the csv module and converts values
+#    to int/float according to the column types ("" becomes NULL), yielding
+#    lists of "batch_size" rows.
+# 3. load: "full" deletes and inserts into the target in one transaction.
+#    "append"/"merge" insert into a stage table and then apply the delta
+#    statements from load_strategy.py.
+# 4. Chunked load: Files larger than "chunk_bytes" are split into
+#    row-aligned byte ranges (_split_chunks) over a memory map of the file:
+#    the rows before "first_row" (the header, as FIRSTROW in BULK INSERT) are
+#    skipped and chunk boundaries never fall inside a quoted value.
+#    "chunk_workers" threads parse and insert the chunks into the stage table
+#    on their own pooled connections; the target is only changed, in one
+#    transaction, once every chunk succeeded.
+#
+# Result:
+# - get_loader(config, logger) returns a loader whose load() reports status,
+#   rows and rows/sec for each table.
+# -----------------------------------------------------------------------------
+
+import csv
+import io
+import mmap
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from logging import Logger
+
+from dbt_operation import parse_result_marker, run_operation
+from load_strategy import apply_load_strategy, build_delta_statements
+from sql_types import DATE_TYPE_PATTERN, FLOAT_TYPE_PATTERN, INTEGER_TYPE_PATTERN
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+DEFAULT_CHUNK_WORKERS = 1
+DEFAULT_FIRST_ROW = 2
+
+
+def _to_iso_date(value: str) -> str:
+    # YYYYMMDD integers (see type_inference) are sent as ISO dates, which every backend accepts.
+    if len(value) == 8 and value.isdigit():
+        return f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return value
+
+
+def _load_result(status: str, rows, start_time: float, message: str = "") -> dict:
+    seconds = time.time() - start_time
+    rows_per_sec = rows / seconds if rows and seconds > 0 else None
+    return {"status": status, "rows": rows, "seconds": seconds, "rows_per_sec": rows_per_sec, "message": message}
+
+
+def _next_row_start(data, start: int, target: int, in_quotes: bool = False) -> tuple:
+    # Returns the offset of the first row starting at or after "target" (a
+    # newline outside quotes), with the quote state from "start" carried over.
+    # Escaped quotes ("") toggle the state twice, so they need no special case.
+    position = start
+    while True:
+        quote = data.find(b'"', position, target)
+        if quote == -1:
+            break
+        in_quotes = not in_quotes
+        position = quote + 1
+
+    position = target
+    while True:
+        newline = data.find(b"\n", position)
+        end = len(data) if newline == -1 else newline
+        quote = data.find(b'"', position, end)
+        while quote != -1:
+            in_quotes = not in_quotes
+            quote = data.find(b'"', quote + 1, end)
+        if newline == -1:
+            return len(data), in_quotes
+        if not in_quotes:
+            return newline + 1, in_quotes
+        position = newline + 1
+
+
+def _split_chunks(data, chunk_bytes: int, first_row: int = DEFAULT_FIRST_ROW) -> list:
+    # (start, end) byte ranges of whole rows, about "chunk_bytes" long each.
+    size = len(data)
+    offset = 0
+    for _ in range(max(first_row - 1, 0)):
+        offset, _ = _next_row_start(data, offset, offset)
+
+    chunks = []
+    while offset < size:
+        end, _ = _next_row_start(data, offset, min(offset + chunk_bytes, size))
+        chunks.append((offset, end))
+        offset = end
+    return chunks
+
+
+class BaseLoader:
+    backend = None
+
+    def __init__(self, config: dict, logger: Logger):
+        self.config = config
+        self.logger = logger
+
+    def load(self, table_name: str, csv_path: str, schema: str, columns: dict, load_strategy: dict) -> dict:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class DbtBulkInsertLoader(BaseLoader):
+    backend = "dbt"
+
+    def load(self, table_name: str, csv_path: str, schema: str, columns: dict, load_strategy: dict) -> dict:
+        start_time = time.time()
+        table_path = f"{schema}.{table_name}"
+
+        if load_strategy is None or load_strategy["strategy"] == "full":
+            macro = "inser_data"
+            insert_args = {
+                "file_path": os.path.abspath(csv_path),
+                "table_path": table_path
+            }
+        else:
+            macro = "load_data_incremental"
+            stage_path = f"{table_path}__stage"
+            insert_args = {
+                "file_path": os.path.abspath(csv_path),
+                "table_path": table_path,
+                "stage_path": stage_path,
+                "statements": build_delta_statements(load_strategy, table_path, stage_path, list(columns.keys()))
+            }
+
+        self.logger.debug(f"Executing DML ({macro}, strategy={(load_strategy or {}).get('strategy', 'full')}) for table {table_name}.")
+        insert_result = run_operation(macro, insert_args, self.logger)
+
+        if insert_result.returncode != 0:
+            self.logger.error(f"FAILURE: DBT {macro} failed for {table_name}.")
+            self.logger.error(f"STDOUT: {insert_result.stdout.strip()}")
+            self.logger.error(f"STDERR: {insert_result.stderr.strip()}")
+            return _load_result("FAILED", None, start_time, f"{macro} failed")
+
+        loaded = parse_result_marker(insert_result.stdout, "[LOAD_RESULT]")
+        return _load_result("SUCCESS", loaded["rows"] if loaded else None, start_time)
+
+
+class ConnectionPool:
+    def __init__(self, connect, size: int = DEFAULT_POOL_SIZE):
+        self._connect = connect
+        self._size = size
+        self._created = 0
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self._size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        connection = self._acquire()
+        try:
+            yield connection
+        except Exception:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class DbApiLoader(BaseLoader):
+    # Subclasses provide _connect() and the dialect-specific statements.
+
+    def __init__(self, config: dict, logger: Logger):
+        super().__init__(config, logger)
+        self.batch_size = config.get("batch_size", DEFAULT_BATCH_SIZE)
+        self.first_row = config.get("first_row", DEFAULT_FIRST_ROW)
+        self.chunk_bytes = config.get("chunk_bytes", DEFAULT_CHUNK_BYTES)
+        self.chunk_workers = config.get("chunk_workers", DEFAULT_CHUNK_WORKERS)
+        self.pool = ConnectionPool(self._connect, config.get("pool_size", DEFAULT_POOL_SIZE))
+
+    def _connect(self):
+        raise NotImplementedError
+
+    def _prepare(self, connection, schema: str, table_name: str, columns: dict) -> None:
+        pass
+
+    def _begin(self, connection) -> None:
+        pass
+
+    def _create_stage_sql(self, table_path: str, stage_path: str) -> list:
+        return [
+            f"DROP TABLE IF EXISTS {stage_path}",
+            f"CREATE TABLE {stage_path} AS SELECT * FROM {table_path} WHERE 1 = 0"
+        ]
+
+    def _configure_cursor(self, cursor) -> None:
+        pass
+
+    @staticmethod
+    def _converters(columns: dict) -> list:
+        converters = []
+        for sql_type in columns.values():
+            if INTEGER_TYPE_PATTERN.match(sql_type):
+                converters.append(int)
+            elif FLOAT_TYPE_PATTERN.match(sql_type):
+                converters.append(float)
+            elif DATE_TYPE_PATTERN.match(sql_type):
+                converters.append(_to_iso_date)
+            else:
+                converters.append(None)
+        return converters
+
+    def _convert_batches(self, records, columns: dict):
+        converters = self._converters(columns)
+        width = len(converters)
+
+        batch = []
+        for record in records:
+            row = []
+            for index in range(width):
+                value = record[index] if index < len(record) else ""
+                if value == "":
+                    row.append(None)
+                    continue
+                convert = converters[index]
+                if convert is not None:
+                    try:
+                        value = convert(value)
+                    except ValueError:
+                        pass
+                row.append(value)
+            batch.append(row)
+
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+    def _read_batches(self, csv_path: str, columns: dict):
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            for _ in range(self.first_row - 1):
+                next(reader, None)
+            yield from self._convert_batches(reader, columns)
+
+    def _read_chunk_batches(self, data, start: int, end: int, columns: dict):
+        # Only this chunk's bytes are copied out of the memory map.
+        text = data[start:end].decode("utf-8")
+        yield from self._convert_batches(csv.reader(io.StringIO(text, newline="")), columns)
+
+    def _insert_rows(self, connection, table_path: str, columns: dict, batches) -> int:
+        column_list = ", ".join(columns.keys())
+        placeholders = ", ".join("?" for _ in columns)
+        statement = f"INSERT INTO {table_path} ({column_list}) VALUES ({placeholders})"
+
+        rows = 0
+        cursor = connection.cursor()
+        try:
+            self._configure_cursor(cursor)
+            for batch in batches:
+                cursor.executemany(statement, batch)
+                rows += len(batch)
+        finally:
+            cursor.close()
+        return rows
+
+    def _create_stage(self, connection, table_path: str, stage_path: str) -> None:
+        self._begin(connection)
+        cursor = connection.cursor()
+        for statement in self._create_stage_sql(table_path, stage_path):
+            cursor.execute(statement)
+        cursor.close()
+        connection.commit()
+
+    def _drop_stage(self, connection, stage_path: str) -> None:
+        self._begin(connection)
+        cursor = connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {stage_path}")
+        cursor.close()
+        connection.commit()
+
+    def _load_chunk(self, data, chunk: tuple, schema: str, table_name: str, stage_path: str, columns: dict) -> int:
+        with self.pool.connection() as connection:
+            self._prepare(connection, schema, table_name, columns)
+            self._begin(connection)
+            rows = self._insert_rows(connection, stage_path, columns, self._read_chunk_batches(data, *chunk, columns))
+            connection.commit()
+        return rows
+
+    def _load_chunked(self, table_name: str, csv_path: str, schema: str, columns: dict, load_strategy: dict) -> int:
+        # Chunks go to the stage table; the target is only touched once all of them succeeded.
+        table_path = f"{schema}.{table_name}"
+        stage_path = f"{table_path}__stage"
+        strategy = (load_strategy or {}).get("strategy", "full")
+
+        with self.pool.connection() as connection:
+            self._prepare(connection, schema, table_name, columns)
+            self._create_stage(connection, table_path, stage_path)
+
+        try:
+            with open(csv_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                chunks = _split_chunks(data, self.chunk_bytes, self.first_row)
+                self.logger.debug(f"Loading {table_name} in {len(chunks)} chunk(s) with {self.chunk_workers} worker(s).")
+                with ThreadPoolExecutor(max_workers=self.chunk_workers) as executor:
+                    futures = [executor.submit(self._load_chunk, data, chunk, schema, table_name, stage_path, columns)
+                               for chunk in chunks]
+                    rows = sum(future.result() for future in futures)
+
+            with self.pool.connection() as connection:
+                self._begin(connection)
+                if strategy == "full":
+                    column_list = ", ".join(columns.keys())
+                    cursor = connection.cursor()
+                    cursor.execute(f"DELETE FROM {table_path}")
+                    cursor.execute(f"INSERT INTO {table_path} ({column_list}) SELECT {column_list} FROM {stage_path}")
+                    cursor.close()
+                    connection.commit()
+                else:
+                    apply_load_strategy(connection, load_strategy, table_path, stage_path, list(columns.keys()))
+        finally:
+            with self.pool.connection() as connection:
+                self._drop_stage(connection, stage_path)
+
+        return rows
+
+    def load(self, table_name: str, csv_path: str, schema: str, columns: dict, load_strategy: dict) -> dict:
+        start_time = time.time()
+        table_path = f"{schema}.{table_name}"
+        strategy = (load_strategy or {}).get("strategy", "full")
+
+        try:
+            if self.chunk_workers > 1 and os.path.getsize(csv_path) > self.chunk_bytes:
+                rows = self._load_chunked(table_name, csv_path, schema, columns, load_strategy)
+                return _load_result("SUCCESS", rows, start_time)
+
+            with self.pool.connection() as connection:
+                self._prepare(connection, schema, table_name, columns)
+
+                if strategy == "full":
+                    self._begin(connection)
+                    cursor = connection.cursor()
+                    cursor.execute(f"DELETE FROM {table_path}")
+                    cursor.close()
+                    rows = self._insert_rows(connection, table_path, columns, self._read_batches(csv_path, columns))
+                    connection.commit()
+                else:
+                    stage_path = f"{table_path}__stage"
+                    self._create_stage(connection, table_path, stage_path)
+                    self._begin(connection)
+                    rows = self._insert_rows(connection, stage_path, columns, self._read_batches(csv_path, columns))
+                    connection.commit()
+
+                    self._begin(connection)
+                    apply_load_strategy(connection, load_strategy, table_path, stage_path, list(columns.keys()))
+                    self._drop_stage(connection, stage_path)
+
+        except Exception as e:
+            self.logger.error(f"FAILURE: {self.backend} load failed for {table_name}: {e}", exc_info=True)
+            return _load_result("FAILED", None, start_time, str(e))
+
+        return _load_result("SUCCESS", rows, start_time)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class PyodbcLoader(DbApiLoader):
+    backend = "pyodbc"
+
+    def _connect(self):
+        import pyodbc
+
+        return pyodbc.connect(self.config["connection_string"], autocommit=False)
+
+    def _create_stage_sql(self, table_path: str, stage_path: str) -> list:
+        return [
+            f"DROP TABLE IF EXISTS {stage_path}",
+            f"SELECT * INTO {stage_path} FROM {table_path} WHERE 1 = 0"
+        ]
+
+    def _configure_cursor(self, cursor) -> None:
+        cursor.fast_executemany = True
+
+
+class SqliteLoader(DbApiLoader):
+    # Each schema is an attached SQLite file: <database_path>/<schema>.db.
+    backend = "sqlite"
+
+    def __init__(self, config: dict, logger: Logger):
+        self.database_path = config.get("database_path", "local_warehouse")
+        os.makedirs(self.database_path, exist_ok=True)
+        super().__init__(config, logger)
+
+    def _connect(self):
+        import sqlite3
+
+        connection = sqlite3.connect(os.path.join(self.database_path, "main.db"), check_same_thread=False, timeout=60)
+        connection.execute("PRAGMA journal_mode = WAL")
+        return connection
+
+    def _prepare(self, connection, schema: str, table_name: str, columns: dict) -> None:
+        attached = {row[1] for row in connection.execute("PRAGMA database_list")}
+        if schema not in attached:
+            connection.execute(f"ATTACH DATABASE ? AS {schema}", (os.path.join(self.database_path, f"{schema}.db"),))
+            connection.execute(f"PRAGMA {schema}.journal_mode = WAL")
+
+        column_defs = ", ".join(f"{column} {sql_type}" for column, sql_type in columns.items())
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table_name} ({column_defs})")
+        connection.commit()
+
+
+class _DuckdbCursor:
+    # DuckDB cursors are independent connections with their own transaction,
+    # so statements are sent to the owning connection instead.
+    def __init__(self, connection):
+        self._connection = connection
+
+    def execute(self, statement, parameters=None):
+        return self._connection.execute(statement, parameters)
+
+    def executemany(self, statement, parameters):
+        return self._connection.executemany(statement, parameters)
+
+    def close(self):
+        pass
+
+
+class _DuckdbConnection:
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self):
+        return _DuckdbCursor(self._connection)
+
+    def execute(self, statement, parameters=None):
+        return self._connection.execute(statement, parameters)
+
+    def register(self, name, data):
+        self._connection.register(name, data)
+
+    def unregister(self, name):
+        self._connection.unregister(name)
+
+    def begin(self):
+        self._connection.begin()
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def close(self):
+        self._connection.close()
+
+
+class DuckdbLoader(DbApiLoader):
+    backend = "duckdb"
+
+    def __init__(self, config: dict, logger: Logger):
+        super().__init__(config, logger)
+        self._database = None
+        self._database_lock = threading.Lock()
+
+    def _connect(self):
+        import duckdb
+
+        # One database instance per loader; every pooled connection is a cursor of it.
+        with self._database_lock:
+            if self._database is None:
+                self._database = duckdb.connect(self.config.get("database_path", "local_warehouse.duckdb"))
+            return _DuckdbConnection(self._database.cursor())
+
+    def _prepare(self, connection, schema: str, table_name: str, columns: dict) -> None:
+        column_defs = ", ".join(f"{column} {sql_type}" for column, sql_type in columns.items())
+        connection.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table_name} ({column_defs})")
+
+    def _begin(self, connection) -> None:
+        connection.begin()
+
+    def _insert_rows(self, connection, table_path: str, columns: dict, batches) -> int:
+        # DuckDB's executemany is row by row; inserting a registered DataFrame per batch is columnar.
+        import pandas as pd
+
+        column_list = ", ".join(columns.keys())
+        rows = 0
+        for batch in batches:
+            frame = pd.DataFrame(batch, columns=list(columns.keys()), dtype=object)
+            connection.register("load_batch", frame)
+            try:
+                connection.execute(f"INSERT INTO {table_path} ({column_list}) SELECT {column_list} FROM load_batch")
+            finally:
+                connection.unregister("load_batch")
+            rows += len(batch)
+        return rows
+
+    def close(self) -> None:
+        super().close()
+        if self._database is not None:
+            self._database.close()
+
+
+LOADERS = {
+    "dbt": DbtBulkInsertLoader,
+    "pyodbc": PyodbcLoader,
+    "sqlite": SqliteLoader,
+    "duckdb": DuckdbLoader
+}
+
+
+def get_loader(config: dict, logger: Logger) -> BaseLoader:
+
+    config = config or {}
+    backend = config.get("backend", "dbt")
+    if backend not in LOADERS:
+        raise ValueError(f"Unknown loader backend '{backend}'. Expected one of {tuple(LOADERS)}.")
+
+    logger.info(f"Using '{backend}' loader backend.")
+    return LOADERS[backend](config, logger)
@@ -4,39 +4,93 @@
 #
 # Step-by-step:
 # 1. Initialization (__init__): Accepts a 'subdirectory' name (defaulting to
-#    'main') to organize logs. It immediately determines the log path and
+#    'main') to organize logs, plus the logging options (level, asynchronous
+#    mode, buffering and rotation). It immediately determines the log path and
 #    configures the logger.
 # 2. Path Determination (_create_log_directory): Dynamically finds the project's
 #    root folder. It handles both standard execution and environments where the
 #    script is compiled into a frozen executable (e.g., PyInstaller). It creates
-#    the necessary directory structure: './logs/<subdirectory>'.
+#    the necessary directory structure: './logs/<subdirectory>', or
+#    '<base_path>/<subdirectory>' when a 'base_path' is given.
 # 3. File Naming (_create_log_paths): Generates the full file path, naming the
 #    log file after the current date (YYYY-MM-DD.log).
 # 4. Logger Configuration (_configure_logger): Initializes a named logger, sets
-#    the level to DEBUG to capture all messages, and attaches a FileHandler to
-#    write logs to the daily file using UTF-8 encoding. It includes a check to
-#    prevent the addition of duplicate handlers if the LogManager is initialized
-#    multiple times.
+#    its level ('level', DEBUG by default) and builds the file handler:
+#      - A plain FileHandler, or a RotatingFileHandler ('rotation': "size",
+#        'max_bytes', 'backup_count') or a TimedRotatingFileHandler
+#        ('rotation': "time", 'when', 'backup_count').
+#      - With 'buffer_capacity' > 0, records are buffered and written in
+#        blocks of that many records (ERROR and above are written at once).
+#      - With 'async_logging', the logger only gets a QueueHandler: callers
+#        format the message and put it on a queue, and a QueueListener thread
+#        does the file I/O. Worker threads no longer wait on the disk or on
+#        each other's handler lock.
+#    It includes a check to prevent the addition of duplicate handlers if the
+#    LogManager is initialized multiple times.
 # 5. Usage (get_logger): Provides the fully configured logger instance to the
 #    calling application.
-# 6. Cleanup (flush_and_close): Offers an explicit method to flush the log buffer
-#    and close all file handlers, ensuring all pending log messages are written
-#    to disk before application exit.
+# 6. Cleanup (flush_and_close): Offers an explicit method to drain the queue,
+#    flush the log buffer and close all file handlers, ensuring all pending log
+#    messages are written to disk before application exit. It is safe to call
+#    more than once and is also registered with atexit in asynchronous mode.
 #
 # Result:
 # - A centralized and reliable logging system writing daily, timestamped log
 #   files, ready for production use across different execution environments.
 # -----------------------------------------------------------------------------
 
+import atexit
 import os
+import queue
 import sys
 import logging
+import logging.handlers
 from datetime import datetime
 
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    # The message is merged on the calling thread (its arguments may change
+    # afterwards); the formatting itself is left to the listener thread.
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    # Blocks instead of dropping the record when a bounded queue is full.
+    def enqueue(self, record):
+        self.queue.put(record)
+
+    # queue.Queue is already thread-safe: skip the per-handler lock that
+    # logging.Handler.handle would take around every emit.
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+
+class _DrainingQueueListener(logging.handlers.QueueListener):
+    # Waits for room in a bounded queue, so stop() never loses the sentinel.
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
 class LogManager:
-    def __init__(self, subdirectory='main'):
+    def __init__(self, subdirectory='main', level='DEBUG', async_logging=False, queue_size=0, buffer_capacity=0,
+                 rotation=None, max_bytes=10 * 1024 * 1024, backup_count=5, when='midnight', base_path=None):
         self.subdirectory = subdirectory
+        self.base_path = base_path
+        self.level = level
+        self.async_logging = async_logging
+        self.queue_size = queue_size
+        self.buffer_capacity = buffer_capacity
+        self.rotation = rotation
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.when = when
         self.logger = None
+        self.listener = None
+        self._file_handlers = []
         self.log_path = self._create_log_paths()
         self._configure_logger()
 
@@ -45,8 +99,8 @@ class LogManager:
             project_root = os.path.dirname(sys.executable)
         else:
             project_root = os.path.dirname(os.path.abspath(__file__))
-        
-        base_dir = os.path.join(project_root, 'logs')
+
+        base_dir = self.base_path or os.path.join(project_root, 'logs')
         full_path = os.path.join(base_dir, self.subdirectory)
 
         os.makedirs(full_path, exist_ok=True)
@@ -58,20 +112,58 @@ class LogManager:
         log_path = os.path.join(log_directory, f"{today_date}.log")
         return log_path
 
+    def _create_file_handler(self):
+        if self.rotation == 'size':
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8'
+            )
+        elif self.rotation == 'time':
+            handler = logging.handlers.TimedRotatingFileHandler(
+                self.log_path, when=self.when, backupCount=self.backup_count, encoding='utf-8'
+            )
+        elif self.rotation is None:
+            handler = logging.FileHandler(self.log_path, encoding='utf-8')
+        else:
+            raise ValueError(f"Invalid log rotation '{self.rotation}'. Expected 'size', 'time' or null.")
+
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._file_handlers.append(handler)
+
+        if self.buffer_capacity and self.buffer_capacity > 0:
+            handler = logging.handlers.MemoryHandler(self.buffer_capacity, flushLevel=logging.ERROR, target=handler)
+            # The buffer must be flushed before the file it writes to is closed.
+            self._file_handlers.insert(0, handler)
+        return handler
+
     def _configure_logger(self):
         self.logger = logging.getLogger(f'logger_{self.subdirectory}')
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(self.level.upper() if isinstance(self.level, str) else self.level)
 
         if not self.logger.handlers:
-            formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-            handler = logging.FileHandler(self.log_path, encoding='utf-8')
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
+            handler = self._create_file_handler()
+
+            if self.async_logging:
+                log_queue = queue.Queue(maxsize=self.queue_size)
+                self.listener = _DrainingQueueListener(log_queue, handler, respect_handler_level=True)
+                self.listener.start()
+                self.logger.addHandler(_NonBlockingQueueHandler(log_queue))
+                atexit.register(self.flush_and_close)
+            else:
+                self.logger.addHandler(handler)
 
     def get_logger(self):
         return self.logger
 
     def flush_and_close(self):
-        for handler in self.logger.handlers:
+        if self.listener is not None:
+            # Stops the listener thread only after every queued record was handled.
+            self.listener.stop()
+            self.listener = None
+
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                self.logger.removeHandler(handler)
+
+        for handler in dict.fromkeys(self._file_handlers + list(self.logger.handlers)):
             handler.flush()
-            handler.close()
\ No newline at end of file
+            handler.close()
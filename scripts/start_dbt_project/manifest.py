@@ -0,0 +1,130 @@
+# -----------------------------------------------------------------------------
+# This class, DatasetManifest, keeps a persistent record of every dataset the
+# pipeline has seen, so unchanged CSV files are neither profiled nor loaded
+# again on the next run.
+#
+# Step-by-step:
+# 1. Initialization (__init__): Reads the manifest JSON file if it exists
+#    (an empty manifest is used otherwise).
+# 2. Fingerprint (fingerprint): Describes a file by its size and modification
+#    time (mtime_ns). When 'hash_content' is enabled and the mtime changed,
+#    a SHA-256 of the content is used to tell a real change from a touch/copy.
+# 3. Profiling cache (cached_schema / record_profile): Stores the inferred
+#    schema together with the fingerprint and a key of the rules used to
+#    infer it. The schema is reused only if both still match.
+# 4. Load cache (needs_load / record_load): Stores the status and fingerprint
+#    of the last load, so a table is reloaded only if its file changed or the
+#    previous load did not succeed.
+# 5. Applied schema (applied_schema / record_applied_schema): The column
+#    types a table was last created or altered with, used by schema_drift to
+#    tell a source change from a change made to the live table.
+# 6. Persistence (save): Writes the manifest atomically (temporary file +
+#    rename). All methods are thread-safe, as tables are loaded concurrently.
+#
+# Result:
+# - Nightly runs only pay for the sources that actually changed. Passing
+#   force=True to the pipeline functions bypasses the cache.
+# -----------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import threading
+
+
+class DatasetManifest:
+    def __init__(self, manifest_path: str, hash_content: bool = False):
+        self.manifest_path = manifest_path
+        self.hash_content = hash_content
+        self._lock = threading.Lock()
+        self._datasets = self._read()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("datasets", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _sha256(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, file_path: str) -> dict:
+        stat = os.stat(file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _matches(self, stored: dict, file_path: str) -> bool:
+        if not stored:
+            return False
+
+        current = self.fingerprint(file_path)
+        if stored.get("size") != current["size"]:
+            return False
+        if stored.get("mtime_ns") == current["mtime_ns"]:
+            return True
+        if self.hash_content and stored.get("sha256"):
+            return stored["sha256"] == self._sha256(file_path)
+        return False
+
+    def _full_fingerprint(self, file_path: str) -> dict:
+        fingerprint = self.fingerprint(file_path)
+        if self.hash_content:
+            fingerprint["sha256"] = self._sha256(file_path)
+        return fingerprint
+
+    def cached_schema(self, name: str, file_path: str, rules_key: str):
+        with self._lock:
+            entry = self._datasets.get(name, {})
+        if entry.get("rules_key") != rules_key or "schema" not in entry:
+            return None
+        if not self._matches(entry.get("fingerprint"), file_path):
+            return None
+        return entry["schema"]
+
+    def record_profile(self, name: str, file_path: str, schema: dict, rules_key: str) -> None:
+        fingerprint = self._full_fingerprint(file_path)
+        with self._lock:
+            entry = self._datasets.setdefault(name, {})
+            entry["file"] = file_path
+            entry["fingerprint"] = fingerprint
+            entry["rules_key"] = rules_key
+            entry["schema"] = schema
+
+    def needs_load(self, name: str, file_path: str) -> bool:
+        with self._lock:
+            entry = self._datasets.get(name, {})
+        if entry.get("load_status") != "SUCCESS":
+            return True
+        return not self._matches(entry.get("loaded_fingerprint"), file_path)
+
+    def record_load(self, name: str, file_path: str, status: str) -> None:
+        fingerprint = self._full_fingerprint(file_path)
+        with self._lock:
+            entry = self._datasets.setdefault(name, {})
+            entry["load_status"] = status
+            entry["loaded_fingerprint"] = fingerprint
+
+    def applied_schema(self, name: str):
+        with self._lock:
+            return self._datasets.get(name, {}).get("applied_schema")
+
+    def record_applied_schema(self, name: str, schema: dict) -> None:
+        with self._lock:
+            self._datasets.setdefault(name, {})["applied_schema"] = dict(schema)
+
+    def save(self) -> None:
+        with self._lock:
+            content = {"datasets": self._datasets}
+            directory = os.path.dirname(self.manifest_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            temp_path = f"{self.manifest_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=4, ensure_ascii=False)
+            os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,185 @@
+# -----------------------------------------------------------------------------
+# Structured, per-run metrics for the bootstrap pipeline.
+#
+# Step-by-step:
+# 1. MetricsRecorder.span: Context manager that opens a span (stage, table or
+#    operation) and, when it closes, records its wall time, rows processed,
+#    bytes read and rows/sec. Spans nest per thread; spans opened by worker
+#    threads are attached to the stage that is currently open.
+#    The caller fills "rows", "bytes" and "attributes" on the yielded dict.
+# 2. MetricsRecorder.record_span: Records a span measured elsewhere (e.g. in
+#    a profiling worker process).
+# 3. export_jsonl: Writes one JSON object per span to
+#    "<metrics_path>/<run_id>.jsonl", ready to be aggregated across runs.
+# 4. summary_lines: A compact text table (stages, scheduler tasks and tables,
+#    indented by nesting) for the log.
+#    Spans without their own row count show the rows of their children
+#    (e.g. a table shows the rows of its "load" span).
+#
+# The module keeps one active recorder (get_recorder / set_recorder), in the
+# same spirit as logging.getLogger, so instrumented functions do not need an
+# extra argument.
+#
+# Result:
+# - Per-run visibility of where the time goes, including dbt subprocess
+#   startup vs. query time (see dbt_operation.run_operation).
+# -----------------------------------------------------------------------------
+
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class MetricsRecorder:
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open_stage = None
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _finish(self, span: dict) -> None:
+        rows = span.get("rows")
+        seconds = span["wall_seconds"]
+        span["rows_per_sec"] = round(rows / seconds, 2) if rows and seconds > 0 else None
+        with self._lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, kind: str = "operation", **attributes):
+        stack = self._stack()
+        parent = stack[-1] if stack else self._open_stage
+        span = {
+            "run_id": self.run_id,
+            "id": next(self._ids),
+            "parent_id": parent["id"] if parent else None,
+            "name": name,
+            "kind": kind,
+            "start": time.time(),
+            "wall_seconds": None,
+            "rows": None,
+            "bytes": None,
+            "status": "OK",
+            "attributes": dict(attributes)
+        }
+
+        stack.append(span)
+        if kind == "stage":
+            self._open_stage = span
+        try:
+            yield span
+        except Exception:
+            span["status"] = "ERROR"
+            raise
+        finally:
+            stack.pop()
+            if kind == "stage" and self._open_stage is span:
+                self._open_stage = None
+            span["wall_seconds"] = round(time.time() - span["start"], 6)
+            self._finish(span)
+
+    def record_span(self, name: str, kind: str, wall_seconds: float, rows: int = None, bytes_read: int = None,
+                    status: str = "OK", **attributes) -> dict:
+        stack = self._stack()
+        parent = stack[-1] if stack else self._open_stage
+        span = {
+            "run_id": self.run_id,
+            "id": next(self._ids),
+            "parent_id": parent["id"] if parent else None,
+            "name": name,
+            "kind": kind,
+            "start": time.time() - wall_seconds,
+            "wall_seconds": round(wall_seconds, 6),
+            "rows": rows,
+            "bytes": bytes_read,
+            "status": status,
+            "attributes": dict(attributes)
+        }
+        self._finish(span)
+        return span
+
+    def export_jsonl(self, metrics_path: str) -> str:
+        os.makedirs(metrics_path, exist_ok=True)
+        file_path = os.path.join(metrics_path, f"{self.run_id}.jsonl")
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["id"])
+        with open(file_path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span, ensure_ascii=False, default=str) + "\n")
+        return file_path
+
+    def summary_lines(self) -> list:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["id"])
+
+        children = {}
+        for span in spans:
+            children.setdefault(span["parent_id"], []).append(span)
+
+        def rows_of(span: dict):
+            if span["rows"] is not None:
+                return span["rows"]
+            child_rows = [rows_of(child) for child in children.get(span["id"], [])]
+            child_rows = [rows for rows in child_rows if rows is not None]
+            return sum(child_rows) if child_rows else None
+
+        def dbt_times(span_id: int) -> tuple:
+            startup, query = 0.0, 0.0
+            for child in children.get(span_id, []):
+                startup += child["attributes"].get("dbt_startup_seconds") or 0.0
+                query += child["attributes"].get("dbt_query_seconds") or 0.0
+                child_startup, child_query = dbt_times(child["id"])
+                startup += child_startup
+                query += child_query
+            return startup, query
+
+        summary_kinds = ("stage", "task", "table")
+        spans_by_id = {span["id"]: span for span in spans}
+
+        def depth(span: dict) -> int:
+            parent = spans_by_id.get(span["parent_id"])
+            if parent is None:
+                return 0
+            return depth(parent) + (1 if parent["kind"] in summary_kinds else 0)
+
+        lines = [f"{'span':<40} {'wall (s)':>10} {'rows':>12} {'rows/sec':>12} {'dbt startup':>12} {'dbt query':>10}"]
+        for span in spans:
+            if span["kind"] not in summary_kinds:
+                continue
+            startup, query = dbt_times(span["id"])
+            indent = "  " * depth(span)
+            rows = rows_of(span)
+            seconds = span["wall_seconds"]
+            rows_per_sec = f"{rows / seconds:.0f}" if rows and seconds > 0 else ""
+            rows = rows if rows is not None else ""
+            lines.append(
+                f"{(indent + span['name'])[:40]:<40} {span['wall_seconds']:>10.3f} {rows:>12} {rows_per_sec:>12} "
+                f"{startup:>12.3f} {query:>10.3f}"
+            )
+        return lines
+
+
+_recorder = MetricsRecorder()
+
+
+def get_recorder() -> MetricsRecorder:
+    return _recorder
+
+
+def set_recorder(recorder: MetricsRecorder) -> None:
+    global _recorder
+    _recorder = recorder
+
+
+def span(name: str, kind: str = "operation", **attributes):
+    return _recorder.span(name, kind, **attributes)
@@ -0,0 +1,198 @@
+# -----------------------------------------------------------------------------
+# Small dependency-aware task scheduler with checkpoint/resume, used by
+# main.py to run the bootstrap pipeline as a DAG.
+#
+# Step-by-step:
+# 1. Task: A named callable (returning True on success) with the names of
+#    the tasks it depends on and a trigger rule:
+#      - "all_success" (default): runs once every dependency succeeded; if
+#        one failed, the task is BLOCKED without running.
+#      - "all_done": runs once every dependency finished, whatever the
+#        outcome (used for wrap-up steps such as writing the sources YAML).
+# 2. Scheduler.add: Registers a task. Dependencies must already exist, so
+#    the graph cannot contain cycles. Tasks may add new tasks while the
+#    scheduler is running (e.g. one task per table, once the tables are
+#    known).
+# 3. Scheduler.run: Submits every ready task to a thread pool as soon as its
+#    dependencies allow it, so independent branches overlap. Each task runs
+#    inside a metrics span of kind "task".
+# 4. Checkpoint: After each task, the state file records the tasks that
+#    finished successfully (written atomically, like the manifest). On the
+#    next run with the same "run_key" (a fingerprint of the configuration),
+#    those tasks are RESTORED instead of being run again, so a failed run
+#    resumes where it stopped. Tasks created with checkpoint=False always
+#    run. When every task succeeds, the state file is removed and the next
+#    run starts from the beginning.
+#
+# Result:
+# - A failing table only blocks the tasks that depend on it, and rerunning
+#   the same command redoes only what did not finish.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from logging import Logger
+
+import metrics
+
+TRIGGERS = ("all_success", "all_done")
+SUCCESS_STATUSES = ("DONE", "RESTORED")
+FINISHED_STATUSES = ("DONE", "RESTORED", "FAILED", "BLOCKED")
+
+
+class Task:
+    def __init__(self, name: str, func, depends_on: list = None, trigger: str = "all_success", checkpoint: bool = True):
+        if trigger not in TRIGGERS:
+            raise ValueError(f"Invalid trigger '{trigger}' for task {name}. Expected one of {TRIGGERS}.")
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+        self.trigger = trigger
+        self.checkpoint = checkpoint
+        self.status = "PENDING"
+        self.duration = 0.0
+        self.message = ""
+
+
+class Scheduler:
+    def __init__(self, logger: Logger, state_path: str = None, run_key: str = None, max_workers: int = 1,
+                 resume: bool = True):
+        self.logger = logger
+        self.state_path = state_path
+        self.run_key = run_key
+        self.max_workers = max(1, max_workers)
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self._completed = self._read_state() if resume else {}
+
+    def _read_state(self) -> dict:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        if state.get("run_key") != self.run_key:
+            self.logger.info("Configuration changed since the last checkpoint, starting from the beginning.")
+            return {}
+        return state.get("completed", {})
+
+    def _save_state(self) -> None:
+        if not self.state_path:
+            return
+        with self._lock:
+            content = {"run_key": self.run_key, "completed": dict(self._completed)}
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            temp_path = f"{self.state_path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=4, ensure_ascii=False)
+            os.replace(temp_path, self.state_path)
+
+    def add(self, name: str, func, depends_on: list = None, trigger: str = "all_success", checkpoint: bool = True) -> Task:
+
+        task = Task(name, func, depends_on, trigger, checkpoint)
+        with self._lock:
+            if name in self.tasks:
+                raise ValueError(f"Task {name} is already registered.")
+            missing = [dependency for dependency in task.depends_on if dependency not in self.tasks]
+            if missing:
+                raise ValueError(f"Task {name} depends on unknown task(s): {', '.join(missing)}")
+
+            if checkpoint and name in self._completed:
+                task.status = "RESTORED"
+                self.logger.info(f"Task {name} already completed in a previous run, restored from checkpoint.")
+            self.tasks[name] = task
+        return task
+
+    def _next_ready(self) -> list:
+        # Called with the lock held: resolves BLOCKED tasks and returns the runnable ones.
+        ready = []
+        changed = True
+        while changed:
+            changed = False
+            for task in self.tasks.values():
+                if task.status != "PENDING":
+                    continue
+                dependencies = [self.tasks[name] for name in task.depends_on]
+                if any(dependency.status not in FINISHED_STATUSES for dependency in dependencies):
+                    continue
+
+                failed = [dependency.name for dependency in dependencies if dependency.status not in SUCCESS_STATUSES]
+                if failed and task.trigger == "all_success":
+                    task.status = "BLOCKED"
+                    task.message = f"blocked by {', '.join(failed)}"
+                    changed = True
+                    continue
+
+                task.status = "RUNNING"
+                ready.append(task)
+        return ready
+
+    def _execute(self, task: Task) -> None:
+
+        start_time = time.time()
+        try:
+            with metrics.span(task.name, "task") as task_span:
+                succeeded = bool(task.func())
+                if not succeeded:
+                    task_span["status"] = "ERROR"
+            task.status = "DONE" if succeeded else "FAILED"
+        except Exception as e:
+            self.logger.error(f"CRITICAL ERROR in task {task.name}: {e}", exc_info=True)
+            task.status = "FAILED"
+            task.message = str(e)
+        finally:
+            task.duration = time.time() - start_time
+
+        log = self.logger.info if task.status == "DONE" else self.logger.error
+        log(f"Task {task.name} finished with status {task.status} in {task.duration:.4f} seconds.")
+
+        if task.status == "DONE" and task.checkpoint:
+            with self._lock:
+                self._completed[task.name] = datetime.now().isoformat(timespec="seconds")
+            self._save_state()
+
+    def run(self) -> bool:
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = set()
+            while True:
+                with self._lock:
+                    ready = self._next_ready()
+                for task in ready:
+                    self.logger.info(f"Starting task {task.name}.")
+                    running.add(executor.submit(self._execute, task))
+
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+        for task in self.tasks.values():
+            if task.status == "BLOCKED":
+                self.logger.warning(f"Task {task.name} was not run: {task.message}.")
+
+        succeeded = all(task.status in SUCCESS_STATUSES for task in self.tasks.values())
+        if succeeded and self.state_path and os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        elif not succeeded and self.state_path:
+            self.logger.warning(f"Checkpoint kept at {self.state_path}: run the same command again to resume.")
+        return succeeded
+
+    def summary_lines(self) -> list:
+        with self._lock:
+            tasks = list(self.tasks.values())
+        return [
+            f"{task.name}: {task.status} ({task.duration:.4f}s){' - ' + task.message if task.message else ''}"
+            for task in tasks
+        ]
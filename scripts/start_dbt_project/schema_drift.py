@@ -0,0 +1,311 @@
+# -----------------------------------------------------------------------------
+# Schema drift: brings existing bronze tables in line with a newly inferred
+# column_types.json with in-place ALTER TABLE statements, instead of failing
+# the load (or dropping and reloading the table) when a source gains a
+# column or a value outgrows its type.
+#
+# Step-by-step:
+# 1. describe_tables: One "dbt run-operation describe_tables" call returns
+#    the live columns of every table (adapter.get_columns_in_relation).
+# 2. plan_drift: Diffs, per table, the desired columns against the live ones:
+#      - ADD:          column missing in the table, added as NULL.
+#      - ALTER:        live type narrower than the desired one; the column
+#                      is widened to the smallest type that holds both
+#                      (e.g. VARCHAR(20) + NVARCHAR(10) -> NVARCHAR(20)),
+#                      so a narrower inference never shrinks a column.
+#      - INCOMPATIBLE: different type families (e.g. INT -> DATE); not
+#                      changed (needs a rebuild).
+#      - REMOVED:      column no longer in the source; reported, kept.
+#    Each change says where it comes from, using the schema saved in the
+#    manifest when the table was last created or altered: "source" (the
+#    inferred type changed since) or "live" (the table differs from what
+#    was applied, e.g. a manual change or a failed ALTER).
+# 3. apply: Every ADD/ALTER of every table is sent as one T-SQL batch in a
+#    single transaction (run_statements macro), so either all tables are
+#    altered or none. ALTER COLUMN fails on a column that is part of an
+#    index, so the indexes on the altered columns of a table are dropped
+#    first in the same batch; the index step (index_advisor, with
+#    indexes.apply) creates them again after the load.
+# 4. Report: The planned diff is logged and written to "report_path". With
+#    dry_run (or "cli.py drift --dry-run") nothing is applied.
+# 5. Status: "FAILED" when the tables could not be described or the batch
+#    was rolled back; "INCOMPATIBLE" when some tables need a rebuild. Those
+#    tables are listed in "incompatible" and create_table fails their table
+#    and load tasks, since the new values would not fit the live columns.
+#    With allow_incompatible they are only reported and loaded as before.
+#
+# Result:
+# - A new column or a longer string costs an ALTER TABLE, not a rebuild and
+#   full reload of the table.
+# -----------------------------------------------------------------------------
+
+import os
+import re
+from logging import Logger
+
+from dbt_operation import parse_result_marker, run_operation
+from manifest import DatasetManifest
+from sql_types import DECIMAL_TYPES, FLOAT_TYPES, INTEGER_TYPE_NAMES, STRING_TYPES
+
+TYPE_PATTERN = re.compile(r"^\s*([A-Za-z]+)\s*(?:\(\s*(MAX|\d+)\s*(?:,\s*(\d+)\s*)?\))?\s*$", re.IGNORECASE)
+DEFAULT_DECIMAL = (18, 0)
+MAX_DECIMAL_PRECISION = 38
+MAX_SIZE = -1
+
+
+def parse_type(sql_type: str) -> tuple:
+    # "NVARCHAR(50)" -> ("NVARCHAR", 50), "VARCHAR(MAX)" -> ("VARCHAR", -1), "INT" -> ("INT", None),
+    # "DECIMAL(18,2)" -> ("DECIMAL", (18, 2)).
+    match = TYPE_PATTERN.match(sql_type or "")
+    if match is None:
+        return (sql_type or "").strip().upper(), None
+    base, size, scale = match.group(1).upper(), match.group(2), match.group(3)
+    if base == "INTEGER":
+        base = "INT"
+    if base in DECIMAL_TYPES and (size is None or size.isdigit()):
+        if size is None:
+            return base, DEFAULT_DECIMAL
+        return base, (int(size), int(scale or 0))
+    if size is None:
+        return base, None
+    return base, MAX_SIZE if size.upper() == "MAX" else int(size)
+
+
+def format_type(base: str, size) -> str:
+    if size is None:
+        return base
+    if isinstance(size, tuple):
+        return f"{base}({size[0]},{size[1]})"
+    return f"{base}({'MAX' if size == MAX_SIZE else size})"
+
+
+def _live_type(column: dict) -> tuple:
+    base = (column.get("dtype") or "").upper()
+    if base in STRING_TYPES:
+        return base, column.get("char_size")
+    if base in DECIMAL_TYPES and column.get("numeric_precision"):
+        return base, (column["numeric_precision"], column.get("numeric_scale") or 0)
+    return parse_type(base)
+
+
+def _merge_types(live: tuple, desired: tuple):
+    # Smallest type that holds the values of both, or None across type families.
+    (live_base, live_size), (desired_base, desired_size) = live, desired
+    if live == desired:
+        return live
+
+    if live_base in STRING_TYPES and desired_base in STRING_TYPES:
+        unicode = live_base.startswith("N") or desired_base.startswith("N")
+        variable = "VAR" in live_base or "VAR" in desired_base
+        if MAX_SIZE in (live_size, desired_size):
+            size = MAX_SIZE
+        else:
+            size = max(live_size or 1, desired_size or 1)
+        return ("N" if unicode else "") + ("VARCHAR" if variable else "CHAR"), size
+
+    if live_base in DECIMAL_TYPES and desired_base in DECIMAL_TYPES:
+        # Keeps the integer digits and the scale of both: DECIMAL(10,2) + DECIMAL(12,0) -> DECIMAL(14,2).
+        (live_precision, live_scale), (desired_precision, desired_scale) = live_size, desired_size
+        scale = max(live_scale, desired_scale)
+        precision = max(live_precision - live_scale, desired_precision - desired_scale) + scale
+        return (live_base, (precision, scale)) if precision <= MAX_DECIMAL_PRECISION else None
+
+    if live_base in INTEGER_TYPE_NAMES and desired_base in INTEGER_TYPE_NAMES:
+        return max(live, desired, key=lambda sql_type: INTEGER_TYPE_NAMES.index(sql_type[0]))
+
+    if {live_base, desired_base} <= set(INTEGER_TYPE_NAMES + FLOAT_TYPES):
+        return "FLOAT", None
+
+    if live_base == desired_base and live_size is None and desired_size is None:
+        return live
+    return None
+
+
+def _origin(column: str, desired: dict, previous: dict) -> str:
+    if previous is None:
+        return "unknown"
+    return "live" if previous.get(column) == desired.get(column) else "source"
+
+
+def _change(table_name: str, column: str, action: str, source, target, origin: str, statement: str = None) -> dict:
+    return {"table": table_name, "column": column, "action": action, "from": source, "to": target, "origin": origin,
+            "statement": statement}
+
+
+def plan_drift(table_name: str, schema: str, desired: dict, live: dict, previous: dict = None) -> list:
+    # Returns [{"table", "column", "action", "from", "to", "origin", "statement"}] (statement None when not applied).
+
+    table_path = f"{schema}.{table_name}"
+    changes = []
+    for column, sql_type in desired.items():
+        origin = _origin(column, desired, previous)
+        desired_type = parse_type(sql_type)
+
+        if column not in live:
+            target = format_type(*desired_type)
+            changes.append(_change(table_name, column, "ADD", None, target, origin,
+                                   f"ALTER TABLE {table_path} ADD {column} {target} NULL"))
+            continue
+
+        live_type = _live_type(live[column])
+        merged = _merge_types(live_type, desired_type)
+        if merged == live_type:
+            continue
+
+        if merged is None:
+            changes.append(_change(table_name, column, "INCOMPATIBLE", format_type(*live_type), format_type(*desired_type),
+                                   origin))
+        else:
+            target = format_type(*merged)
+            changes.append(_change(table_name, column, "ALTER", format_type(*live_type), target, origin,
+                                   f"ALTER TABLE {table_path} ALTER COLUMN {column} {target} NULL"))
+
+    for column, live_column in live.items():
+        if column not in desired:
+            changes.append(_change(table_name, column, "REMOVED", format_type(*_live_type(live_column)), None,
+                                   _origin(column, desired, previous)))
+    return changes
+
+
+def describe_tables(table_names: list, schema: str, logger: Logger):
+    # {table: {column: {"dtype", "char_size"}} or None}, or None if the call failed.
+
+    result = run_operation("describe_tables", {"schema": schema, "tables": table_names}, logger)
+    described = parse_result_marker(result.stdout, "[DESCRIBE_RESULT]")
+    if result.returncode != 0 or described is None:
+        logger.error("FAILURE: DBT describe_tables failed.")
+        logger.error(f"STDOUT: {result.stdout.strip()}")
+        logger.error(f"STDERR: {result.stderr.strip()}")
+        return None
+    return described
+
+
+def _batch_statement(statements: list) -> str:
+    body = "\n".join(f"    {statement};" for statement in statements)
+    return (
+        "BEGIN TRY\n"
+        "    BEGIN TRANSACTION;\n"
+        f"{body}\n"
+        "    COMMIT TRANSACTION;\n"
+        "END TRY\n"
+        "BEGIN CATCH\n"
+        "    IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION;\n"
+        "    THROW;\n"
+        "END CATCH"
+    )
+
+
+def _drop_indexes_statement(table_name: str, schema: str, columns: list) -> str:
+    # Drops every index (not primary key or unique constraints) that has one of the columns as key or
+    # included column. One variable per table, since all tables share one batch.
+
+    table_path = f"{schema}.{table_name}"
+    variable = f"@drop_indexes_{table_name}"
+    names = ", ".join(f"'{column}'" for column in columns)
+    return (
+        f"DECLARE {variable} NVARCHAR(MAX) = N'';\n"
+        f"    SELECT {variable} = {variable} + N'DROP INDEX ' + QUOTENAME(i.name) + N' ON {table_path}; '\n"
+        f"    FROM sys.indexes i\n"
+        f"    WHERE i.object_id = OBJECT_ID('{table_path}') AND i.is_primary_key = 0 AND i.is_unique_constraint = 0\n"
+        f"      AND EXISTS (SELECT 1 FROM sys.index_columns ic JOIN sys.columns c\n"
+        f"                  ON c.object_id = ic.object_id AND c.column_id = ic.column_id\n"
+        f"                  WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id AND c.name IN ({names}));\n"
+        f"    EXEC sp_executesql {variable}"
+    )
+
+
+def _apply_statements(changes: list, schema: str) -> list:
+    # The statements of every change, each table's ALTERs preceded by the drop of their indexes.
+
+    statements = []
+    for table_name in dict.fromkeys(change["table"] for change in changes):
+        table_changes = [change for change in changes if change["table"] == table_name and change["statement"]]
+        altered = [change["column"] for change in table_changes if change["action"] == "ALTER"]
+        if altered:
+            statements.append(_drop_indexes_statement(table_name, schema, altered))
+        statements.extend(change["statement"] for change in table_changes)
+    return statements
+
+
+def report_lines(changes: list, new_tables: list) -> list:
+
+    lines = [f"{table_name}: new table, will be created" for table_name in new_tables]
+    for change in changes:
+        if change["action"] == "ADD":
+            detail = f"ADD {change['column']} {change['to']}"
+        elif change["action"] == "REMOVED":
+            detail = f"REMOVED {change['column']} {change['from']} (kept in the table)"
+        else:
+            detail = f"{change['action']} {change['column']} {change['from']} -> {change['to']}"
+        lines.append(f"{change['table']}: {detail} [{change['origin']}]")
+    return lines or ["No schema drift."]
+
+
+def check_schema_drift(column_type: dict, schema: str, logger: Logger, manifest: DatasetManifest = None,
+                       dry_run: bool = False, report_path: str = None, allow_incompatible: bool = False) -> dict:
+    # Returns {"status": "OK" | "INCOMPATIBLE" | "FAILED", "changes", "applied", "report", "incompatible"}.
+
+    live_tables = describe_tables(list(column_type), schema, logger)
+    if live_tables is None:
+        return {"status": "FAILED", "changes": [], "applied": False, "report": [], "incompatible": []}
+
+    changes = []
+    new_tables = []
+    for table_name, desired in column_type.items():
+        live = live_tables.get(table_name)
+        if live is None:
+            new_tables.append(table_name)
+            continue
+        previous = manifest.applied_schema(table_name) if manifest is not None else None
+        changes.extend(plan_drift(table_name, schema, desired, live, previous))
+
+    report = report_lines(changes, new_tables)
+    logger.info(f"Schema drift report{' (dry run)' if dry_run else ''}:")
+    for line in report:
+        logger.info(f"  {line}")
+
+    incompatible = sorted({change["table"] for change in changes if change["action"] == "INCOMPATIBLE"})
+    for change in changes:
+        if change["action"] != "INCOMPATIBLE":
+            continue
+        message = (f"{change['table']}.{change['column']} cannot be altered from {change['from']} to {change['to']}; "
+                   f"the table must be rebuilt")
+        if allow_incompatible:
+            logger.warning(f"{message} (allow_incompatible: the table is still loaded).")
+        else:
+            logger.error(f"FAILURE: {message}. The table is not loaded.")
+
+    if report_path:
+        directory = os.path.dirname(report_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(report) + "\n")
+
+    statements = _apply_statements(changes, schema)
+    if dry_run or not statements:
+        applied = False
+    else:
+        logger.info(f"Applying {len(statements)} statement(s) in one transaction.")
+        if any(change["action"] == "ALTER" for change in changes):
+            logger.info("Indexes on altered columns are dropped first; the index step creates them again "
+                        "(indexes.apply), or re-run the index advice script.")
+        result = run_operation("run_statements", {"statements": [_batch_statement(statements)]}, logger)
+        if result.returncode != 0:
+            logger.error("FAILURE: Schema drift ALTER batch failed and was rolled back.")
+            logger.error(f"STDOUT: {result.stdout.strip()}")
+            logger.error(f"STDERR: {result.stderr.strip()}")
+            return {"status": "FAILED", "changes": changes, "applied": False, "report": report,
+                    "incompatible": incompatible}
+        applied = True
+        logger.info(f"SUCCESS: Schema drift applied ({len(statements)} statement(s)).")
+
+    if manifest is not None and not dry_run:
+        for table_name, desired in column_type.items():
+            if live_tables.get(table_name) is not None and table_name not in incompatible:
+                manifest.record_applied_schema(table_name, desired)
+
+    if incompatible and not allow_incompatible:
+        return {"status": "INCOMPATIBLE", "changes": changes, "applied": applied, "report": report,
+                "incompatible": incompatible}
+    return {"status": "OK", "changes": changes, "applied": applied, "report": report, "incompatible": []}
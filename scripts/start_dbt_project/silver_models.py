@@ -0,0 +1,182 @@
+# -----------------------------------------------------------------------------
+# Generates typed, incremental silver models ("models/marts/slv_<table>.sql")
+# from column_types.json, so downstream queries read a table that only grows
+# by the new bronze rows instead of re-reading and re-casting the staging
+# views.
+#
+# Step-by-step:
+# 1. detect_unique_key: The "unique_keys" override of the "silver_models"
+#    section, else the "key" of a merge load strategy, else the first column
+#    that is exactly unique in the profile report (whole file scanned, no
+#    nulls, every value counted once), preferring id-like names. Approximate
+#    distinct counts are not enough: a key with a few duplicates would make
+#    the incremental merge fail. Without one the model gets no unique_key.
+# 2. detect_watermark: The "watermarks" override, else the "watermark" of an
+#    append load strategy, else a mostly non-null DATE column whose name
+#    hints at a load/change date (WATERMARK_NAME_HINTS, in that order; a
+#    birth date, for instance, does not grow with new rows). Tables without
+#    one are materialized as plain tables, since an incremental model
+#    without a filter would re-read and merge every bronze row on each run.
+# 3. render_silver_model: Explicit column list with CASTs to the types of
+#    column_types.json, materialized='incremental' with the unique_key, and
+#    an is_incremental() filter that only reads rows at or after the
+#    watermark already in the model ("{{ this }}"). Without a unique_key the
+#    increment is appended, so only rows after the watermark are read; a
+#    table without a watermark is materialized as a plain table. Bronze has
+#    no load timestamp, so when it is not append-only (full reloads, merge)
+#    a row changed in place keeps its old watermark and is not picked up;
+#    the model header says so and points to --full-refresh.
+# 4. write_silver_models: Writes one model per table. Existing files are
+#    overwritten, like the stg models.
+#
+# Result:
+# - Each dbt run on the silver layer processes only the new bronze rows.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+from fnmatch import fnmatchcase
+from logging import Logger
+from pathlib import Path
+
+DEFAULT_PREFIX = "slv_"
+ID_NAME_PATTERNS = ("id", "*_id", "*_key", "cid", "*_num")
+WATERMARK_NAME_HINTS = ("updat", "modif", "load", "creat", "order", "start")
+
+
+def read_profile(profile_path: str, table_name: str) -> dict:
+    if not profile_path:
+        return {}
+    try:
+        with open(os.path.join(profile_path, f"{table_name}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def is_id_name(column: str) -> bool:
+    return any(fnmatchcase(column, pattern) for pattern in ID_NAME_PATTERNS)
+
+
+def is_exactly_unique(column: str, profile: dict) -> bool:
+    column_profile = profile.get("columns", {}).get(column, {})
+    if profile.get("sampled") or not column_profile.get("count") or column_profile.get("null_count") != 0:
+        return False
+    if "unique" in column_profile:
+        return column_profile["unique"] is True
+    # Profiles written before the exact check: only a complete top-values summary proves it.
+    top_values = column_profile.get("top_values") or []
+    return bool(column_profile.get("top_values_exact") and top_values and top_values[0]["count"] == 1)
+
+
+def unique_columns(columns: dict, profile: dict) -> list:
+    return [column for column in columns if is_exactly_unique(column, profile)]
+
+
+def detect_unique_key(table_name: str, columns: dict, profile: dict, load_strategy: dict = None,
+                      unique_keys: dict = None) -> list:
+    # Returns [] when no column is known to be unique.
+
+    if (unique_keys or {}).get(table_name):
+        key = unique_keys[table_name]
+        return [key] if isinstance(key, str) else list(key)
+    if load_strategy and load_strategy.get("strategy") == "merge":
+        return list(load_strategy["key"])
+
+    candidates = unique_columns(columns, profile)
+    preferred = [column for column in candidates if is_id_name(column)]
+    return (preferred or candidates)[:1]
+
+
+def detect_watermark(table_name: str, columns: dict, profile: dict, load_strategy: dict = None,
+                     watermarks: dict = None):
+
+    if (watermarks or {}).get(table_name):
+        return watermarks[table_name]
+    if load_strategy and load_strategy.get("strategy") == "append":
+        return load_strategy["watermark"]
+
+    column_profiles = profile.get("columns", {})
+    date_columns = [column for column, sql_type in columns.items() if sql_type.strip().upper() == "DATE"]
+    # Mostly-null dates (e.g. an end date) are poor watermarks.
+    date_columns = [column for column in date_columns if (column_profiles.get(column, {}).get("null_ratio") or 0) < 0.5]
+    for hint in WATERMARK_NAME_HINTS:
+        for column in date_columns:
+            if hint in column:
+                return column
+    return None
+
+
+def render_silver_model(table_name: str, columns: dict, unique_key: list, watermark: str = None,
+                        load_strategy: str = "full") -> str:
+
+    select_list = ",\n".join(f"    CAST({column} AS {sql_type}) AS {column}" for column, sql_type in columns.items())
+
+    if watermark and unique_key:
+        unique_key_list = ", ".join(f"'{column}'" for column in unique_key)
+        config = ["        materialized='incremental',", f"        unique_key=[{unique_key_list}]"]
+    elif watermark:
+        config = ["        materialized='incremental'"]
+    else:
+        config = ["        materialized='table'"]
+
+    lines = ["{# Generated from column_types.json by create_table.py; regenerated on every run. #}"]
+    if watermark and load_strategy != "append":
+        lines += [
+            f"{{# Bronze is loaded with the '{load_strategy}' strategy: a row changed in place keeps its {watermark},",
+            f"   so changes to rows older than MAX({watermark}) of this model are not picked up; run this",
+            "   model with --full-refresh after such changes. #}"
+        ]
+    lines += [
+        "{{",
+        "    config(",
+        *config,
+        "    )",
+        "}}",
+        "",
+        "SELECT",
+        select_list,
+        f"FROM {{{{ ref('stg_{table_name}') }}}}"
+    ]
+    if watermark:
+        # Rows at the watermark are re-read and merged on the unique_key; without one they would be duplicated.
+        operator = ">=" if unique_key else ">"
+        lines += [
+            "{% if is_incremental() %}",
+            f"WHERE {watermark} {operator} (SELECT MAX({watermark}) FROM {{{{ this }}}})",
+            f"   OR (SELECT MAX({watermark}) FROM {{{{ this }}}}) IS NULL",
+            "{% endif %}"
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def write_silver_models(column_type: dict, table_names: list, strategies: dict, dbt_marts_path: str, logger: Logger,
+                        profile_path: str = None, prefix: str = DEFAULT_PREFIX, unique_keys: dict = None,
+                        watermarks: dict = None) -> list:
+
+    Path(dbt_marts_path).mkdir(parents=True, exist_ok=True)
+
+    written = []
+    for table_name in table_names:
+        columns = column_type[table_name]
+        profile = read_profile(profile_path, table_name)
+        load_strategy = (strategies or {}).get(table_name)
+        unique_key = detect_unique_key(table_name, columns, profile, load_strategy, unique_keys)
+        watermark = detect_watermark(table_name, columns, profile, load_strategy, watermarks)
+        if not watermark:
+            logger.info(f"No watermark found for {table_name}; its silver model is a plain table "
+                        f"(set one in silver_models.watermarks).")
+        elif not unique_key:
+            logger.warning(f"No exactly unique column found for {table_name}; its silver model has no unique_key "
+                           f"(set one in silver_models.unique_keys).")
+
+        sql_file_path = Path(dbt_marts_path) / f"{prefix}{table_name}.sql"
+        with open(sql_file_path, "w", encoding="utf-8") as f:
+            f.write(render_silver_model(table_name, columns, unique_key, watermark,
+                                        (load_strategy or {}).get("strategy", "full")))
+
+        logger.info(f"Silver model created: {sql_file_path} (unique_key={', '.join(unique_key) or 'none'}, "
+                    f"watermark={watermark or 'none'})")
+        written.append(str(sql_file_path))
+
+    return written
@@ -0,0 +1,42 @@
+# -----------------------------------------------------------------------------
+# The SQL Server column types the pipeline understands, in one place, so
+# type inference, schema drift, validation and the loaders agree on them.
+#
+# Step-by-step:
+# 1. Integer types: INTEGER_TYPES lists TINYINT/SMALLINT/INT/BIGINT from the
+#    narrowest to the widest with their ranges (type_inference picks the
+#    first that fits, schema_drift widens along the same order).
+#    INTEGER_RANGES adds the INTEGER synonym for the checks by name.
+# 2. Families: FLOAT_TYPES, DECIMAL_TYPES and STRING_TYPES name the other
+#    type families that schema_drift can merge.
+# 3. Patterns: The *_TYPE_PATTERN regexes classify a full type string such
+#    as "VARCHAR(13)" or "DECIMAL(10,2)" (validation, loaders).
+#    ISO_DATE_PATTERN matches a YYYY-MM-DD value.
+#
+# Result:
+# - A new type or range is added here once instead of in every module.
+# -----------------------------------------------------------------------------
+
+import re
+
+INTEGER_TYPES = (
+    ("TINYINT", 0, 255),
+    ("SMALLINT", -32768, 32767),
+    ("INT", -2147483648, 2147483647),
+    ("BIGINT", -9223372036854775808, 9223372036854775807)
+)
+INTEGER_TYPE_NAMES = tuple(sql_type for sql_type, _, _ in INTEGER_TYPES)
+INTEGER_RANGES = dict(
+    {sql_type: (type_min, type_max) for sql_type, type_min, type_max in INTEGER_TYPES},
+    INTEGER=(-2147483648, 2147483647)
+)
+FLOAT_TYPES = ("REAL", "FLOAT")
+DECIMAL_TYPES = ("DECIMAL", "NUMERIC")
+STRING_TYPES = ("CHAR", "VARCHAR", "NCHAR", "NVARCHAR")
+
+INTEGER_TYPE_PATTERN = re.compile(r"^(TINYINT|SMALLINT|INT|INTEGER|BIGINT)\b", re.IGNORECASE)
+FLOAT_TYPE_PATTERN = re.compile(r"^(FLOAT|REAL|DOUBLE|DECIMAL|NUMERIC)\b", re.IGNORECASE)
+DATE_TYPE_PATTERN = re.compile(r"^DATE$", re.IGNORECASE)
+BIT_TYPE_PATTERN = re.compile(r"^BIT$", re.IGNORECASE)
+STRING_TYPE_PATTERN = re.compile(r"^N?(VAR)?CHAR\s*\(\s*(\d+)\s*\)$", re.IGNORECASE)
+ISO_DATE_PATTERN = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
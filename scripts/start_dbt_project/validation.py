@@ -0,0 +1,193 @@
+# -----------------------------------------------------------------------------
+# Pre-load validation: checks every row of a CSV file against the column
+# types of column_types.json before it is sent to the warehouse, so a single
+# bad value no longer fails (and empties) the whole table load.
+#
+# Step-by-step:
+# 1. _column_checks: Turns each SQL type into a check function:
+#      - TINYINT/SMALLINT/INT/BIGINT: an integer within the range of the type.
+#      - FLOAT/REAL/DECIMAL/NUMERIC: a finite number.
+#      - DATE: a calendar date written as YYYYMMDD or YYYY-MM-DD.
+#      - BIT: 0/1/true/false.
+#      - (N)VARCHAR(n)/(N)CHAR(n): at most n characters.
+#    Empty values are NULLs and always pass.
+# 2. validate_csv: Streams the CSV once. Valid rows are written to
+#    "<output_path>/<table>.csv" (same header, so FIRSTROW = 2 still applies),
+#    rejected rows to "<output_path>/<table>.quarantine.csv" with their line
+#    number and reason codes (e.g. "sls_order_dt:INVALID_DATE"). Rows with a
+#    wrong number of fields are rejected as COLUMN_COUNT.
+# 3. Report: Per-table row and reject counts (by reason code) are returned
+#    and written to "<output_path>/<table>.validation.json".
+#
+# Result:
+# - create_table loads the clean file and only the rejected rows need a fix,
+#   instead of a failed full reload. A table whose reject ratio exceeds
+#   "max_reject_ratio" is not loaded at all.
+# -----------------------------------------------------------------------------
+
+import csv
+import json
+import math
+import os
+from datetime import date
+from logging import Logger
+
+import metrics
+from sql_types import (BIT_TYPE_PATTERN, DATE_TYPE_PATTERN, FLOAT_TYPE_PATTERN, INTEGER_RANGES, INTEGER_TYPE_PATTERN,
+                       ISO_DATE_PATTERN, STRING_TYPE_PATTERN)
+
+DEFAULT_OUTPUT_PATH = "validated"
+DEFAULT_MAX_REJECT_RATIO = 1.0
+BIT_VALUES = {"0", "1", "true", "false"}
+
+
+def _check_integer(low: int, high: int):
+    def check(value: str):
+        try:
+            number = int(value)
+        except ValueError:
+            return "INVALID_INTEGER"
+        if not low <= number <= high:
+            return "OUT_OF_RANGE"
+        return None
+    return check
+
+
+def _check_float(value: str):
+    try:
+        number = float(value)
+    except ValueError:
+        return "INVALID_NUMBER"
+    if not math.isfinite(number):
+        return "INVALID_NUMBER"
+    return None
+
+
+def _check_date(value: str):
+    if len(value) == 8 and value.isdigit():
+        parts = (value[:4], value[4:6], value[6:])
+    else:
+        match = ISO_DATE_PATTERN.match(value)
+        if match is None:
+            return "INVALID_DATE"
+        parts = match.groups()
+    try:
+        date(*(int(part) for part in parts))
+    except ValueError:
+        return "INVALID_DATE"
+    return None
+
+
+def _check_bit(value: str):
+    return None if value.lower() in BIT_VALUES else "INVALID_BIT"
+
+
+def _check_length(max_length: int):
+    def check(value: str):
+        return "TOO_LONG" if len(value) > max_length else None
+    return check
+
+
+def _column_checks(columns: dict) -> list:
+    # One check per column (None when any value is accepted, e.g. NVARCHAR(MAX)).
+    checks = []
+    for sql_type in columns.values():
+        sql_type = sql_type.strip()
+        integer_match = INTEGER_TYPE_PATTERN.match(sql_type)
+        string_match = STRING_TYPE_PATTERN.match(sql_type)
+        if integer_match:
+            checks.append(_check_integer(*INTEGER_RANGES[integer_match.group(1).upper()]))
+        elif FLOAT_TYPE_PATTERN.match(sql_type):
+            checks.append(_check_float)
+        elif DATE_TYPE_PATTERN.match(sql_type):
+            checks.append(_check_date)
+        elif BIT_TYPE_PATTERN.match(sql_type):
+            checks.append(_check_bit)
+        elif string_match:
+            checks.append(_check_length(int(string_match.group(2))))
+        else:
+            checks.append(None)
+    return checks
+
+
+def validate_csv(table_name: str, csv_path: str, columns: dict, logger: Logger, output_path: str = DEFAULT_OUTPUT_PATH,
+                 max_reject_ratio: float = DEFAULT_MAX_REJECT_RATIO) -> dict:
+    # Returns {"status": "VALID" | "REJECTED", "rows", "rejected", "reasons", "clean_path", "quarantine_path"}.
+
+    os.makedirs(output_path, exist_ok=True)
+    clean_path = os.path.join(output_path, f"{table_name}.csv")
+    quarantine_path = os.path.join(output_path, f"{table_name}.quarantine.csv")
+    column_names = list(columns.keys())
+    checks = _column_checks(columns)
+    width = len(checks)
+
+    rows = 0
+    rejected = 0
+    reasons = {}
+    with metrics.span("validate", "operation") as validate_span:
+        with open(csv_path, "r", encoding="utf-8", newline="") as source, \
+                open(clean_path, "w", encoding="utf-8", newline="") as clean, \
+                open(quarantine_path, "w", encoding="utf-8", newline="") as quarantine:
+            reader = csv.reader(source)
+            clean_writer = csv.writer(clean, lineterminator="\n")
+            quarantine_writer = csv.writer(quarantine, lineterminator="\n")
+
+            header = next(reader, None)
+            clean_writer.writerow(header or column_names)
+            quarantine_writer.writerow(["line", "reasons"] + (header or column_names))
+
+            for record in reader:
+                rows += 1
+                if len(record) != width:
+                    codes = ["COLUMN_COUNT"]
+                else:
+                    codes = []
+                    for column_name, check, value in zip(column_names, checks, record):
+                        if value == "" or check is None:
+                            continue
+                        code = check(value)
+                        if code is not None:
+                            codes.append(f"{column_name}:{code}")
+
+                if codes:
+                    rejected += 1
+                    for code in codes:
+                        reasons[code] = reasons.get(code, 0) + 1
+                    # reader.line_num is the last physical line of the record.
+                    quarantine_writer.writerow([reader.line_num, ";".join(codes)] + record)
+                else:
+                    clean_writer.writerow(record)
+
+        # Not "rows": the span is a child of the table's load task, whose row count sums its children.
+        validate_span["attributes"]["rows_validated"] = rows
+        validate_span["attributes"]["rejected"] = rejected
+
+        status = "VALID"
+        if rows and rejected / rows > max_reject_ratio:
+            status = "REJECTED"
+            validate_span["status"] = "ERROR"
+
+    report = {
+        "table": table_name,
+        "source": os.path.abspath(csv_path),
+        "status": status,
+        "rows": rows,
+        "rejected": rejected,
+        "reasons": dict(sorted(reasons.items(), key=lambda item: -item[1])),
+        "clean_path": os.path.abspath(clean_path),
+        "quarantine_path": os.path.abspath(quarantine_path)
+    }
+    with open(os.path.join(output_path, f"{table_name}.validation.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+
+    if rejected:
+        summary = ", ".join(f"{code}={count}" for code, count in report["reasons"].items())
+        logger.warning(f"{rejected} of {rows} row(s) of {table_name} quarantined in {quarantine_path} ({summary}).")
+    else:
+        logger.info(f"SUCCESS: All {rows} row(s) of {table_name} passed validation.")
+
+    if status == "REJECTED":
+        logger.error(f"FAILURE: Reject ratio of {table_name} ({rejected}/{rows}) is above {max_reject_ratio}, "
+                     f"the table is not loaded.")
+
+    return report
@@ -17,6 +17,7 @@ Notes:
 
 
 {% macro create_multiple_schemas(schema_list) %}
+  {{ log_query_start() }}
   {% for schema in schema_list %}
 
     {{ log("Creating schema if not exists: " ~ schema, info=True) }}
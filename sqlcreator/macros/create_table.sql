@@ -44,6 +44,6 @@
   {%- endset %}
 
   {{ log("[CREATE] " ~ ddl, info=True) }}
-  {% if execute_ddl %}{% do run_query(ddl) %}{% endif %}
+  {% if execute_ddl %}{{ log_query_start() }}{% do run_query(ddl) %}{% endif %}
   {{ return(ddl) }}
 {%- endmacro %}
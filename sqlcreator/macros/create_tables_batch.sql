@@ -0,0 +1,62 @@
+{#
+This macro creates many tables in a single dbt session.
+
+How it works:
+- It receives a dictionary `tables` in the format {table_name: {column: type}}
+  (or the same structure as a JSON string).
+- For each table it calls the `create_table` macro with `execute_ddl=false`,
+  which reuses the `adapter.get_relation` check: existing tables come back
+  as "SKIP", missing tables come back as their CREATE TABLE statement.
+- Each CREATE TABLE is executed inside a T-SQL TRY/CATCH block, so one failing
+  table does not abort the others.
+- The status of every table (CREATE, SKIP or ERROR with its message) is logged
+  as a single JSON line prefixed with "[BATCH_RESULT]", which the Python
+  caller parses.
+
+Notes:
+- Avoids paying dbt's startup (project parsing, adapter loading, connection)
+  once per table.
+- This macro is specific to SQL Server (T-SQL syntax).
+#}
+
+{% macro create_tables_batch(tables, schema=none, database=target.database, execute_ddl=true) -%}
+  {% if tables is string %}
+    {% set tables = tables | fromjson %}
+  {% endif %}
+  {% if not (tables is mapping) %}
+    {%- do exceptions.raise_compiler_error("O parâmetro 'tables' deve ser um dicionário {tabela: {coluna: tipo}}.") -%}
+  {% endif %}
+
+  {{ log_query_start() }}
+  {% set results = {} %}
+  {% for table_name, columns in tables.items() %}
+    {% set ddl = create_table(table_name=table_name, columns=columns, schema=schema, database=database, execute_ddl=false) %}
+
+    {% if ddl == "SKIP" %}
+      {% do results.update({table_name: {"status": "SKIP", "message": ""}}) %}
+    {% elif not execute_ddl %}
+      {% do results.update({table_name: {"status": "CREATE", "message": ""}}) %}
+    {% else %}
+      {% set guarded_ddl %}
+        BEGIN TRY
+          EXEC('{{ ddl | replace("'", "''") }}');
+          SELECT 'CREATE' AS status, CAST('' AS NVARCHAR(4000)) AS message;
+        END TRY
+        BEGIN CATCH
+          SELECT 'ERROR' AS status, ERROR_MESSAGE() AS message;
+        END CATCH
+      {% endset %}
+
+      {% set outcome = run_query(guarded_ddl) %}
+      {% set status = outcome.columns[0].values()[0] %}
+      {% set message = outcome.columns[1].values()[0] %}
+      {% if status == "ERROR" %}
+        {{ log("[ERROR] " ~ table_name ~ ": " ~ message, info=True) }}
+      {% endif %}
+      {% do results.update({table_name: {"status": status, "message": message}}) %}
+    {% endif %}
+  {% endfor %}
+
+  {{ log("[BATCH_RESULT] " ~ tojson(results), info=True) }}
+  {{ return(results) }}
+{%- endmacro %}
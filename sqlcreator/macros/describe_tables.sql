@@ -0,0 +1,45 @@
+{#
+This macro reports the live columns of several tables in a single dbt session.
+
+How it works:
+- It receives a list `tables` of table names (or the same list as a JSON
+  string) and the schema they live in.
+- For each table it looks the relation up with `adapter.get_relation` and, if
+  it exists, reads its columns with `adapter.get_columns_in_relation`.
+- The result is logged as a single JSON line prefixed with "[DESCRIBE_RESULT]":
+  {table: {column: {"dtype": ..., "char_size": ..., "numeric_precision": ...,
+  "numeric_scale": ...}}}, with null for tables that do not exist. char_size
+  is -1 for (N)VARCHAR(MAX).
+
+Notes:
+- Used by schema_drift.py to compare column_types.json with the tables that
+  are actually in the warehouse.
+#}
+
+{% macro describe_tables(tables, schema=none, database=target.database) -%}
+  {% if tables is string %}
+    {% set tables = tables | fromjson %}
+  {% endif %}
+  {% if schema is none or schema|length == 0 %}
+    {% set schema = target.schema %}
+  {% endif %}
+
+  {{ log_query_start() }}
+  {% set results = {} %}
+  {% for table_name in tables %}
+    {% set relation = adapter.get_relation(database=database, schema=schema, identifier=table_name) %}
+    {% if relation is none %}
+      {% do results.update({table_name: none}) %}
+    {% else %}
+      {% set columns = {} %}
+      {% for column in adapter.get_columns_in_relation(relation) %}
+        {% do columns.update({column.name | lower: {"dtype": column.dtype | lower, "char_size": column.char_size,
+                                                "numeric_precision": column.numeric_precision,
+                                                "numeric_scale": column.numeric_scale}}) %}
+      {% endfor %}
+      {% do results.update({table_name: columns}) %}
+    {% endif %}
+  {% endfor %}
+
+  {{ log("[DESCRIBE_RESULT] " ~ tojson(results), info=True) }}
+{%- endmacro %}
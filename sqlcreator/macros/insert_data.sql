@@ -2,7 +2,8 @@
   {% set path = file_path | replace('\\', '\\\\') %}
 
   {% set sql %}
-    TRUNCATE TABLE {{ table_path }}
+    SET NOCOUNT ON;
+    TRUNCATE TABLE {{ table_path }};
     BULK INSERT {{ table_path }}
     FROM '{{ path }}'
     WITH ( 
@@ -11,8 +12,11 @@
         ROWTERMINATOR = '0x0a', 
         CODEPAGE = '65001', 
         TABLOCK );
+    SELECT @@ROWCOUNT AS loaded_rows;
   {% endset %}
 
   {{ log('[INSERT] ' ~ table_path ~ ' <= ' ~ file_path, info=True) }}
-  {% do run_query(sql) %}
+  {{ log_query_start() }}
+  {% set outcome = run_query(sql) %}
+  {{ log('[LOAD_RESULT] ' ~ tojson({"rows": outcome.columns[0].values()[0] | int}), info=True) }}
 {% endmacro %}
\ No newline at end of file
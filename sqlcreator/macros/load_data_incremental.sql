@@ -0,0 +1,54 @@
+{#
+This macro loads a CSV file into a table using a stage table, so only new or
+changed rows reach the target.
+
+How it works:
+- It (re)creates `stage_path` as an empty copy of `table_path`.
+- It runs BULK INSERT of the CSV file into the stage table.
+- It runs the `statements` list (built in Python by load_strategy.py for the
+  "append" or "merge" strategy) inside a single transaction with XACT_ABORT,
+  so the target is either fully updated or left untouched.
+- The stage table is dropped at the end.
+- The rows read from the file (@@ROWCOUNT of the BULK INSERT) are logged as
+  "[LOAD_RESULT] {"rows": n}" once the delta was applied.
+
+Notes:
+- This macro is specific to SQL Server (T-SQL syntax).
+- The "full" strategy keeps using the `inser_data` macro.
+#}
+
+{% macro load_data_incremental(file_path, table_path, stage_path, statements) %}
+  {% set path = file_path | replace('\\', '\\\\') %}
+
+  {% set stage_sql %}
+    SET NOCOUNT ON;
+    IF OBJECT_ID('{{ stage_path }}', 'U') IS NOT NULL DROP TABLE {{ stage_path }};
+    SELECT * INTO {{ stage_path }} FROM {{ table_path }} WHERE 1 = 0;
+    BULK INSERT {{ stage_path }}
+    FROM '{{ path }}'
+    WITH (
+        FIRSTROW = 2,
+        FIELDTERMINATOR = ',',
+        ROWTERMINATOR = '0x0a',
+        CODEPAGE = '65001',
+        TABLOCK );
+    SELECT @@ROWCOUNT AS loaded_rows;
+  {% endset %}
+
+  {% set delta_sql %}
+    SET XACT_ABORT ON;
+    BEGIN TRANSACTION;
+    {% for statement in statements %}
+    {{ statement }};
+    {% endfor %}
+    COMMIT TRANSACTION;
+    DROP TABLE {{ stage_path }};
+  {% endset %}
+
+  {{ log('[STAGE] ' ~ stage_path ~ ' <= ' ~ file_path, info=True) }}
+  {{ log_query_start() }}
+  {% set outcome = run_query(stage_sql) %}
+  {{ log('[DELTA] ' ~ table_path ~ ' <= ' ~ stage_path, info=True) }}
+  {% do run_query(delta_sql) %}
+  {{ log('[LOAD_RESULT] ' ~ tojson({"rows": outcome.columns[0].values()[0] | int}), info=True) }}
+{% endmacro %}
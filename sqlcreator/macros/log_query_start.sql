@@ -0,0 +1,13 @@
+{#
+This macro logs the current time as "[QUERY_START] <epoch seconds>".
+
+How it works:
+- Operation macros call it right before their first query.
+- The Python caller (dbt_operation.run_operation) compares it with the time
+  the dbt process was started, which separates dbt's own startup (parsing
+  the project, loading the adapter) from the time spent running queries.
+#}
+
+{% macro log_query_start() %}
+  {{ log("[QUERY_START] " ~ modules.datetime.datetime.now().timestamp(), info=True) }}
+{% endmacro %}
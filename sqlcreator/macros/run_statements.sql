@@ -0,0 +1,26 @@
+{#
+This macro runs a list of SQL statements, one query per statement, in order.
+
+How it works:
+- It receives `statements`, a list of SQL strings (or the same list as a
+  JSON string).
+- Each statement is logged and executed with `run_query`; the first failing
+  statement stops the operation with an error.
+
+Notes:
+- Used by index_advisor.py to create the suggested indexes after a table was
+  loaded. The statements are generated with IF NOT EXISTS guards, so running
+  the macro again is safe.
+#}
+
+{% macro run_statements(statements) %}
+  {% if statements is string %}
+    {% set statements = statements | fromjson %}
+  {% endif %}
+
+  {{ log_query_start() }}
+  {% for statement in statements %}
+    {{ log("[RUN] " ~ statement, info=True) }}
+    {% do run_query(statement) %}
+  {% endfor %}
+{% endmacro %}
@@ -0,0 +1,23 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{# Bronze is loaded with the 'full' strategy: a row changed in place keeps its cst_create_date,
+   so changes to rows older than MAX(cst_create_date) of this model are not picked up; run this
+   model with --full-refresh after such changes. #}
+{{
+    config(
+        materialized='incremental'
+    )
+}}
+
+SELECT
+    CAST(cst_id AS INT) AS cst_id,
+    CAST(cst_key AS VARCHAR(13)) AS cst_key,
+    CAST(cst_firstname AS NVARCHAR(14)) AS cst_firstname,
+    CAST(cst_lastname AS NVARCHAR(20)) AS cst_lastname,
+    CAST(cst_marital_status AS VARCHAR(2)) AS cst_marital_status,
+    CAST(cst_gndr AS VARCHAR(2)) AS cst_gndr,
+    CAST(cst_create_date AS DATE) AS cst_create_date
+FROM {{ ref('stg_crm_cust_info') }}
+{% if is_incremental() %}
+WHERE cst_create_date > (SELECT MAX(cst_create_date) FROM {{ this }})
+   OR (SELECT MAX(cst_create_date) FROM {{ this }}) IS NULL
+{% endif %}
@@ -0,0 +1,24 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{# Bronze is loaded with the 'full' strategy: a row changed in place keeps its prd_start_date,
+   so changes to rows older than MAX(prd_start_date) of this model are not picked up; run this
+   model with --full-refresh after such changes. #}
+{{
+    config(
+        materialized='incremental',
+        unique_key=['prd_id']
+    )
+}}
+
+SELECT
+    CAST(prd_id AS INT) AS prd_id,
+    CAST(prd_key AS VARCHAR(20)) AS prd_key,
+    CAST(prd_nm AS VARCHAR(40)) AS prd_nm,
+    CAST(prd_cost AS FLOAT) AS prd_cost,
+    CAST(prd_line AS VARCHAR(3)) AS prd_line,
+    CAST(prd_start_date AS DATE) AS prd_start_date,
+    CAST(prd_end_date AS DATE) AS prd_end_date
+FROM {{ ref('stg_crm_prd_info') }}
+{% if is_incremental() %}
+WHERE prd_start_date >= (SELECT MAX(prd_start_date) FROM {{ this }})
+   OR (SELECT MAX(prd_start_date) FROM {{ this }}) IS NULL
+{% endif %}
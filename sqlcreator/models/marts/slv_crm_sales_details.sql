@@ -0,0 +1,26 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{# Bronze is loaded with the 'merge' strategy: a row changed in place keeps its sls_order_dt,
+   so changes to rows older than MAX(sls_order_dt) of this model are not picked up; run this
+   model with --full-refresh after such changes. #}
+{{
+    config(
+        materialized='incremental',
+        unique_key=['sls_ord_num', 'sls_prd_key']
+    )
+}}
+
+SELECT
+    CAST(sls_ord_num AS VARCHAR(9)) AS sls_ord_num,
+    CAST(sls_prd_key AS VARCHAR(13)) AS sls_prd_key,
+    CAST(sls_cust_id AS INT) AS sls_cust_id,
+    CAST(sls_order_dt AS DATE) AS sls_order_dt,
+    CAST(sls_ship_dt AS DATE) AS sls_ship_dt,
+    CAST(sls_due_dt AS DATE) AS sls_due_dt,
+    CAST(sls_sales AS FLOAT) AS sls_sales,
+    CAST(sls_quantity AS TINYINT) AS sls_quantity,
+    CAST(sls_price AS FLOAT) AS sls_price
+FROM {{ ref('stg_crm_sales_details') }}
+{% if is_incremental() %}
+WHERE sls_order_dt >= (SELECT MAX(sls_order_dt) FROM {{ this }})
+   OR (SELECT MAX(sls_order_dt) FROM {{ this }}) IS NULL
+{% endif %}
@@ -0,0 +1,12 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+SELECT
+    CAST(cid AS VARCHAR(17)) AS cid,
+    CAST(bdate AS DATE) AS bdate,
+    CAST(gen AS VARCHAR(8)) AS gen
+FROM {{ ref('stg_erp_cust_az12') }}
@@ -0,0 +1,11 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+SELECT
+    CAST(cid AS VARCHAR(14)) AS cid,
+    CAST(cntry AS VARCHAR(18)) AS cntry
+FROM {{ ref('stg_erp_loc_a101') }}
@@ -0,0 +1,13 @@
+{# Generated from column_types.json by create_table.py; regenerated on every run. #}
+{{
+    config(
+        materialized='table'
+    )
+}}
+
+SELECT
+    CAST(id AS VARCHAR(7)) AS id,
+    CAST(cat AS VARCHAR(14)) AS cat,
+    CAST(subcat AS VARCHAR(22)) AS subcat,
+    CAST(maintenance AS VARCHAR(4)) AS maintenance
+FROM {{ ref('stg_erp_px_cat_g1v2') }}
@@ -0,0 +1,108 @@
+import sqlite3
+
+import pytest
+
+from load_strategy import apply_load_strategy, build_delta_statements, get_load_strategy
+
+COLUMNS = ["sls_ord_num", "sls_prd_key", "sls_sales"]
+MERGE = {"strategy": "merge", "key": ["sls_ord_num", "sls_prd_key"]}
+
+
+def _warehouse(target_rows: list, stage_rows: list) -> sqlite3.Connection:
+    connection = sqlite3.connect(":memory:")
+    for table_name, rows in (("sales", target_rows), ("sales_stage", stage_rows)):
+        connection.execute(f"CREATE TABLE {table_name} (sls_ord_num TEXT, sls_prd_key TEXT, sls_sales INTEGER)")
+        connection.executemany(f"INSERT INTO {table_name} VALUES (?, ?, ?)", rows)
+    connection.commit()
+    return connection
+
+
+def _rows(connection: sqlite3.Connection) -> list:
+    return sorted(connection.execute("SELECT * FROM sales").fetchall())
+
+
+def test_full_replaces_the_table():
+    statements = build_delta_statements({"strategy": "full"}, "bronze.sales", "bronze.sales_stage", COLUMNS)
+
+    assert statements == [
+        "DELETE FROM bronze.sales",
+        "INSERT INTO bronze.sales (sls_ord_num, sls_prd_key, sls_sales) "
+        "SELECT sls_ord_num, sls_prd_key, sls_sales FROM bronze.sales_stage"
+    ]
+
+
+def test_append_inserts_new_rows_from_the_watermark_on():
+    statements = build_delta_statements({"strategy": "append", "watermark": "sls_ord_num"}, "bronze.sales",
+                                        "bronze.sales_stage", COLUMNS)
+
+    recent = "sls_ord_num >= (SELECT MAX(sls_ord_num) FROM bronze.sales) OR sls_ord_num IS NULL"
+    assert statements == [
+        "INSERT INTO bronze.sales (sls_ord_num, sls_prd_key, sls_sales) "
+        "SELECT sls_ord_num, sls_prd_key, sls_sales FROM bronze.sales_stage "
+        f"WHERE {recent} OR NOT EXISTS (SELECT 1 FROM bronze.sales) "
+        f"EXCEPT SELECT sls_ord_num, sls_prd_key, sls_sales FROM bronze.sales WHERE {recent}"
+    ]
+
+
+def test_append_keeps_late_rows_of_the_last_watermark_and_null_watermarks():
+    connection = _warehouse(
+        target_rows=[("SO1", "P1", 10), ("SO2", "P1", 20)],
+        stage_rows=[("SO1", "P1", 10), ("SO1", "P3", 15), ("SO2", "P1", 20), ("SO2", "P2", 25), ("SO3", "P1", 30),
+                    (None, "P1", 40)]
+    )
+
+    for _ in range(2):
+        apply_load_strategy(connection, {"strategy": "append", "watermark": "sls_ord_num"}, "sales", "sales_stage",
+                            COLUMNS)
+
+    # SO1/P3 is older than the watermark and stays out; rows already loaded are not inserted again.
+    rows = connection.execute("SELECT * FROM sales ORDER BY sls_ord_num, sls_prd_key").fetchall()
+    assert rows == [(None, "P1", 40), ("SO1", "P1", 10), ("SO2", "P1", 20), ("SO2", "P2", 25), ("SO3", "P1", 30)]
+
+
+def test_merge_matches_on_every_key_column():
+    statements = build_delta_statements(MERGE, "bronze.sales", "bronze.sales_stage", COLUMNS)
+
+    changed_rows = ("SELECT sls_ord_num, sls_prd_key, sls_sales FROM bronze.sales_stage "
+                    "EXCEPT SELECT sls_ord_num, sls_prd_key, sls_sales FROM bronze.sales")
+    assert statements == [
+        f"DELETE FROM bronze.sales WHERE EXISTS (SELECT 1 FROM ({changed_rows}) delta "
+        f"WHERE delta.sls_ord_num = sales.sls_ord_num AND delta.sls_prd_key = sales.sls_prd_key)",
+        f"INSERT INTO bronze.sales (sls_ord_num, sls_prd_key, sls_sales) {changed_rows}"
+    ]
+
+
+def test_merge_writes_new_and_changed_rows_only():
+    connection = _warehouse(
+        target_rows=[("SO1", "P1", 10), ("SO1", "P2", 20), ("SO2", "P1", 30)],
+        stage_rows=[("SO1", "P1", 10), ("SO1", "P2", 25), ("SO3", "P1", 40)]
+    )
+
+    apply_load_strategy(connection, MERGE, "sales", "sales_stage", COLUMNS)
+
+    # SO2 is not in the stage: a merge never deletes rows missing from the source.
+    assert _rows(connection) == [("SO1", "P1", 10), ("SO1", "P2", 25), ("SO2", "P1", 30), ("SO3", "P1", 40)]
+
+
+def test_append_into_an_empty_table_loads_everything():
+    connection = _warehouse(target_rows=[], stage_rows=[("SO1", "P1", 10), ("SO2", "P1", 20)])
+
+    apply_load_strategy(connection, {"strategy": "append", "watermark": "sls_ord_num"}, "sales", "sales_stage", COLUMNS)
+    apply_load_strategy(connection, {"strategy": "append", "watermark": "sls_ord_num"}, "sales", "sales_stage", COLUMNS)
+
+    assert _rows(connection) == [("SO1", "P1", 10), ("SO2", "P1", 20)]
+
+
+def test_get_load_strategy_defaults_to_full_and_normalizes_the_key():
+    assert get_load_strategy({}, "crm_cust_info") == {"strategy": "full"}
+    assert get_load_strategy({"t": {"strategy": "merge", "key": "id"}}, "t") == {"strategy": "merge", "key": ["id"]}
+
+
+@pytest.mark.parametrize("strategy", [
+    {"strategy": "upsert"},
+    {"strategy": "append"},
+    {"strategy": "merge", "key": []}
+])
+def test_get_load_strategy_rejects_invalid_configurations(strategy):
+    with pytest.raises(ValueError):
+        get_load_strategy({"t": strategy}, "t")
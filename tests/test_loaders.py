@@ -0,0 +1,86 @@
+import csv
+import io
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import loaders
+from loaders import DbtBulkInsertLoader, _split_chunks
+
+HEADER = b"id,comment\n"
+
+
+def _rows(data: bytes, chunks: list) -> list:
+    rows = []
+    for start, end in chunks:
+        rows.extend(csv.reader(io.StringIO(data[start:end].decode("utf-8"), newline="")))
+    return rows
+
+
+def _assert_whole_rows(data: bytes, chunks: list, first_row: int = 2) -> None:
+    # Contiguous ranges that cover the file after the header, each parsing to whole rows.
+    expected = list(csv.reader(io.StringIO(data.decode("utf-8"), newline="")))[first_row - 1:]
+    assert chunks[-1][1] == len(data)
+    assert all(previous[1] == current[0] for previous, current in zip(chunks, chunks[1:]))
+    assert _rows(data, chunks) == expected
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 5, 16, 1000])
+def test_split_chunks_keeps_rows_whole(chunk_bytes):
+    data = HEADER + b"".join(b"%d,row %d\n" % (i, i) for i in range(20))
+
+    chunks = _split_chunks(data, chunk_bytes)
+
+    assert chunks[0][0] == len(HEADER)
+    _assert_whole_rows(data, chunks)
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 3, 8, 13, 40])
+def test_split_chunks_does_not_cut_quoted_newlines(chunk_bytes):
+    data = HEADER + b'1,"first\nline"\n2,"say ""hi""\nand\nbye"\n3,plain\n4,"trailing\n"\n'
+
+    chunks = _split_chunks(data, chunk_bytes)
+
+    _assert_whole_rows(data, chunks)
+    assert [row[0] for row in _rows(data, chunks)] == ["1", "2", "3", "4"]
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 4, 9])
+def test_split_chunks_keeps_crlf_line_endings_together(chunk_bytes):
+    data = b"id,comment\r\n" + b"".join(b"%d,value\r\n" % i for i in range(10))
+
+    chunks = _split_chunks(data, chunk_bytes)
+
+    assert all(data[end - 2:end] == b"\r\n" for _, end in chunks)
+    _assert_whole_rows(data, chunks)
+
+
+def test_split_chunks_skips_rows_before_first_row():
+    data = b"# exported 2026-01-01\n" + HEADER + b"1,a\n2,b\n"
+
+    chunks = _split_chunks(data, 4, first_row=3)
+
+    assert chunks[0][0] == data.index(b"1,a")
+    _assert_whole_rows(data, chunks, first_row=3)
+
+
+def test_split_chunks_without_trailing_newline_and_without_rows():
+    data = HEADER + b"1,a\n2,b"
+
+    assert _rows(data, _split_chunks(data, 2)) == [["1", "a"], ["2", "b"]]
+    assert _split_chunks(HEADER, 2) == []
+
+
+@pytest.mark.parametrize("stdout, rows", [
+    ("[QUERY_START] 1\n[INSERT] bronze.t <= t.csv\n[LOAD_RESULT] {\"rows\": 42}\n", 42),
+    ("[QUERY_START] 1\n", None)
+])
+def test_dbt_loader_reports_the_rows_logged_by_the_macro(monkeypatch, stdout, rows):
+    monkeypatch.setattr(loaders, "run_operation",
+                        lambda macro, args, logger: SimpleNamespace(returncode=0, stdout=stdout, stderr=""))
+
+    outcome = DbtBulkInsertLoader({}, logging.getLogger("test")).load("t", "t.csv", "bronze", {"id": "INT"}, None)
+
+    assert outcome["status"] == "SUCCESS"
+    assert outcome["rows"] == rows
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from manifest import DatasetManifest
+
+SCHEMA = {"cst_id": "INT", "cst_key": "VARCHAR(10)"}
+
+
+def _dataset(tmp_path, content: str = "cst_id,cst_key\n1,AW1\n"):
+    file_path = tmp_path / "cust_info.csv"
+    file_path.write_text(content, encoding="utf-8")
+    return str(file_path)
+
+
+def _touch(file_path: str) -> None:
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+
+def test_schema_is_cached_until_the_file_changes(tmp_path):
+    file_path = _dataset(tmp_path)
+    manifest = DatasetManifest(str(tmp_path / "manifest.json"))
+    manifest.record_profile("crm_cust_info", file_path, SCHEMA, "rules-1")
+
+    assert manifest.cached_schema("crm_cust_info", file_path, "rules-1") == SCHEMA
+
+    _dataset(tmp_path, "cst_id,cst_key\n1,AW1\n2,AW2\n")
+    assert manifest.cached_schema("crm_cust_info", file_path, "rules-1") is None
+
+
+def test_other_rules_key_invalidates_the_cached_schema(tmp_path):
+    file_path = _dataset(tmp_path)
+    manifest = DatasetManifest(str(tmp_path / "manifest.json"))
+    manifest.record_profile("crm_cust_info", file_path, SCHEMA, "rules-1")
+
+    assert manifest.cached_schema("crm_cust_info", file_path, "rules-2") is None
+
+
+@pytest.mark.parametrize("hash_content, cached", [(False, False), (True, True)])
+def test_touched_file_is_only_unchanged_with_content_hashing(tmp_path, hash_content, cached):
+    file_path = _dataset(tmp_path)
+    manifest = DatasetManifest(str(tmp_path / "manifest.json"), hash_content=hash_content)
+    manifest.record_profile("crm_cust_info", file_path, SCHEMA, "rules-1")
+
+    _touch(file_path)
+
+    assert (manifest.cached_schema("crm_cust_info", file_path, "rules-1") is not None) == cached
+
+
+def test_only_a_successful_load_of_the_same_file_is_skipped(tmp_path):
+    file_path = _dataset(tmp_path)
+    manifest = DatasetManifest(str(tmp_path / "manifest.json"))
+    assert manifest.needs_load("crm_cust_info", file_path)
+
+    manifest.record_load("crm_cust_info", file_path, "FAILED")
+    assert manifest.needs_load("crm_cust_info", file_path)
+
+    manifest.record_load("crm_cust_info", file_path, "SUCCESS")
+    assert not manifest.needs_load("crm_cust_info", file_path)
+
+    _touch(file_path)
+    assert manifest.needs_load("crm_cust_info", file_path)
+
+
+def test_applied_schema_is_a_copy_and_survives_save(tmp_path):
+    manifest_path = str(tmp_path / "state" / "manifest.json")
+    manifest = DatasetManifest(manifest_path)
+    assert manifest.applied_schema("crm_cust_info") is None
+
+    schema = dict(SCHEMA)
+    manifest.record_applied_schema("crm_cust_info", schema)
+    schema["cst_id"] = "BIGINT"
+    manifest.save()
+
+    assert DatasetManifest(manifest_path).applied_schema("crm_cust_info") == SCHEMA
@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+
+from scheduler import Scheduler
+
+LOGGER = logging.getLogger("test")
+
+
+def _task(calls: list, name: str, succeeded: bool = True):
+    def run():
+        calls.append(name)
+        return succeeded
+    return run
+
+
+def _pipeline(state_path, calls: list, load_succeeds: bool, run_key: str = "v1") -> Scheduler:
+    scheduler = Scheduler(LOGGER, state_path=str(state_path), run_key=run_key)
+    scheduler.add("schemas", _task(calls, "schemas"))
+    scheduler.add("profile", _task(calls, "profile"), depends_on=["schemas"])
+    scheduler.add("load", _task(calls, "load", load_succeeds), depends_on=["profile"])
+    scheduler.add("marts", _task(calls, "marts"), depends_on=["load"])
+    scheduler.add("finish", _task(calls, "finish"), depends_on=["load"], trigger="all_done", checkpoint=False)
+    return scheduler
+
+
+def test_failed_task_blocks_its_dependents_but_not_all_done_tasks(tmp_path):
+    calls = []
+    scheduler = _pipeline(tmp_path / "state.json", calls, load_succeeds=False)
+
+    assert not scheduler.run()
+
+    statuses = {name: task.status for name, task in scheduler.tasks.items()}
+    assert statuses == {"schemas": "DONE", "profile": "DONE", "load": "FAILED", "marts": "BLOCKED", "finish": "DONE"}
+    assert scheduler.tasks["marts"].message == "blocked by load"
+    assert calls == ["schemas", "profile", "load", "finish"]
+
+
+def test_resume_restores_completed_tasks_and_reruns_the_failed_one(tmp_path):
+    state_path = tmp_path / "state.json"
+    _pipeline(state_path, [], load_succeeds=False).run()
+    assert state_path.exists()
+
+    calls = []
+    scheduler = _pipeline(state_path, calls, load_succeeds=True)
+
+    assert scheduler.run()
+    assert calls == ["load", "marts", "finish"]
+    assert scheduler.tasks["profile"].status == "RESTORED"
+    # A fully successful run removes the checkpoint, so the next run starts over.
+    assert not state_path.exists()
+
+
+@pytest.mark.parametrize("run_key, resume", [("v2", True), ("v1", False)])
+def test_checkpoint_is_ignored_for_another_run_key_or_without_resume(tmp_path, run_key, resume):
+    state_path = tmp_path / "state.json"
+    _pipeline(state_path, [], load_succeeds=False).run()
+
+    calls = []
+    scheduler = Scheduler(LOGGER, state_path=str(state_path), run_key=run_key, resume=resume)
+    scheduler.add("schemas", _task(calls, "schemas"))
+
+    assert scheduler.run()
+    assert calls == ["schemas"]
+
+
+def test_blocked_status_propagates_through_the_graph():
+    calls = []
+    scheduler = Scheduler(LOGGER)
+    scheduler.add("profile", _task(calls, "profile", False))
+    scheduler.add("plan", _task(calls, "plan"), depends_on=["profile"])
+    scheduler.add("load", _task(calls, "load"), depends_on=["plan"])
+
+    assert not scheduler.run()
+    assert [scheduler.tasks[name].status for name in ("profile", "plan", "load")] == ["FAILED", "BLOCKED", "BLOCKED"]
+    assert calls == ["profile"]
+
+
+def test_tasks_added_while_running_are_scheduled():
+    calls = []
+    scheduler = Scheduler(LOGGER, max_workers=2)
+
+    def plan():
+        for table_name in ("a", "b"):
+            scheduler.add(f"load:{table_name}", _task(calls, f"load:{table_name}"), depends_on=["plan"])
+        return True
+
+    scheduler.add("plan", plan)
+
+    assert scheduler.run()
+    assert sorted(calls) == ["load:a", "load:b"]
+
+
+def test_exception_fails_the_task_with_its_message():
+    def broken():
+        raise RuntimeError("boom")
+
+    scheduler = Scheduler(LOGGER)
+    scheduler.add("broken", broken)
+
+    assert not scheduler.run()
+    assert scheduler.tasks["broken"].status == "FAILED"
+    assert scheduler.summary_lines()[0].endswith(" - boom")
+
+
+def test_unknown_dependency_and_duplicate_names_are_rejected():
+    scheduler = Scheduler(LOGGER)
+    scheduler.add("a", lambda: True)
+
+    with pytest.raises(ValueError):
+        scheduler.add("a", lambda: True)
+    with pytest.raises(ValueError):
+        scheduler.add("b", lambda: True, depends_on=["missing"])
@@ -0,0 +1,146 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+import schema_drift
+from schema_drift import format_type, parse_type, plan_drift
+
+LIVE = {
+    "sls_ord_num": {"dtype": "varchar", "char_size": 20},
+    "sls_cust_id": {"dtype": "smallint", "char_size": None},
+    "sls_order_dt": {"dtype": "int", "char_size": None},
+    "sls_price": {"dtype": "decimal", "char_size": None, "numeric_precision": 10, "numeric_scale": 2}
+}
+
+
+def _actions(changes: list) -> dict:
+    return {change["column"]: (change["action"], change["from"], change["to"]) for change in changes}
+
+
+@pytest.mark.parametrize("sql_type, parsed, formatted", [
+    ("NVARCHAR(50)", ("NVARCHAR", 50), "NVARCHAR(50)"),
+    ("varchar(max)", ("VARCHAR", -1), "VARCHAR(MAX)"),
+    ("INTEGER", ("INT", None), "INT"),
+    ("DECIMAL(18,2)", ("DECIMAL", (18, 2)), "DECIMAL(18,2)"),
+    ("NUMERIC(10)", ("NUMERIC", (10, 0)), "NUMERIC(10,0)")
+])
+def test_parse_and_format_type(sql_type, parsed, formatted):
+    assert parse_type(sql_type) == parsed
+    assert format_type(*parsed) == formatted
+
+
+def test_new_column_is_added_as_null():
+    desired = {"sls_ord_num": "VARCHAR(20)", "sls_cust_id": "SMALLINT", "sls_order_dt": "INT",
+               "sls_price": "DECIMAL(10,2)", "sls_channel": "VARCHAR(10)"}
+
+    changes = plan_drift("crm_sales_details", "bronze", desired, LIVE)
+
+    assert changes == [{
+        "table": "crm_sales_details", "column": "sls_channel", "action": "ADD", "from": None, "to": "VARCHAR(10)",
+        "origin": "unknown", "statement": "ALTER TABLE bronze.crm_sales_details ADD sls_channel VARCHAR(10) NULL"
+    }]
+
+
+def test_wider_types_are_altered_to_the_smallest_common_type():
+    desired = {"sls_ord_num": "NVARCHAR(30)", "sls_cust_id": "INT", "sls_order_dt": "INT",
+               "sls_price": "DECIMAL(12,4)"}
+
+    changes = plan_drift("crm_sales_details", "bronze", desired, LIVE)
+
+    assert _actions(changes) == {
+        "sls_ord_num": ("ALTER", "VARCHAR(20)", "NVARCHAR(30)"),
+        "sls_cust_id": ("ALTER", "SMALLINT", "INT"),
+        "sls_price": ("ALTER", "DECIMAL(10,2)", "DECIMAL(12,4)")
+    }
+    assert changes[0]["statement"] == "ALTER TABLE bronze.crm_sales_details ALTER COLUMN sls_ord_num NVARCHAR(30) NULL"
+
+
+def test_narrower_inference_never_shrinks_a_column():
+    desired = {"sls_ord_num": "VARCHAR(9)", "sls_cust_id": "TINYINT", "sls_order_dt": "INT",
+               "sls_price": "DECIMAL(5,1)"}
+
+    assert plan_drift("crm_sales_details", "bronze", desired, LIVE) == []
+
+
+def test_mixed_widths_merge_both_sides():
+    # Fewer characters but unicode, fewer decimals but more integer digits.
+    desired = {"sls_ord_num": "NVARCHAR(10)", "sls_cust_id": "SMALLINT", "sls_order_dt": "INT",
+               "sls_price": "DECIMAL(12,0)"}
+
+    assert _actions(plan_drift("crm_sales_details", "bronze", desired, LIVE)) == {
+        "sls_ord_num": ("ALTER", "VARCHAR(20)", "NVARCHAR(20)"),
+        "sls_price": ("ALTER", "DECIMAL(10,2)", "DECIMAL(14,2)")
+    }
+
+
+def test_type_family_change_is_incompatible_and_not_applied():
+    desired = {"sls_ord_num": "VARCHAR(20)", "sls_cust_id": "SMALLINT", "sls_order_dt": "DATE",
+               "sls_price": "DECIMAL(10,2)"}
+
+    changes = plan_drift("crm_sales_details", "bronze", desired, LIVE)
+
+    assert _actions(changes) == {"sls_order_dt": ("INCOMPATIBLE", "INT", "DATE")}
+    assert changes[0]["statement"] is None
+
+
+def test_removed_column_is_reported_and_kept():
+    desired = {"sls_ord_num": "VARCHAR(20)", "sls_cust_id": "SMALLINT", "sls_order_dt": "INT"}
+
+    changes = plan_drift("crm_sales_details", "bronze", desired, LIVE)
+
+    assert _actions(changes) == {"sls_price": ("REMOVED", "DECIMAL(10,2)", None)}
+    assert changes[0]["statement"] is None
+
+
+def test_origin_compares_with_the_applied_schema():
+    desired = {"sls_ord_num": "VARCHAR(40)", "sls_cust_id": "INT", "sls_order_dt": "INT", "sls_price": "DECIMAL(10,2)"}
+    previous = {"sls_ord_num": "VARCHAR(20)", "sls_cust_id": "INT", "sls_order_dt": "INT", "sls_price": "DECIMAL(10,2)"}
+
+    changes = plan_drift("crm_sales_details", "bronze", desired, LIVE, previous)
+
+    # sls_ord_num changed in the source; sls_cust_id was applied as INT but the table still has SMALLINT.
+    assert {change["column"]: change["origin"] for change in changes} == {"sls_ord_num": "source", "sls_cust_id": "live"}
+
+
+@pytest.mark.parametrize("allow_incompatible, status, incompatible", [
+    (False, "INCOMPATIBLE", ["crm_sales_details"]),
+    (True, "OK", [])
+])
+def test_check_schema_drift_reports_incompatible_tables(monkeypatch, allow_incompatible, status, incompatible):
+    calls = []
+    monkeypatch.setattr(schema_drift, "describe_tables", lambda table_names, schema, logger: {
+        "crm_sales_details": LIVE, "crm_cust_info": {"cst_id": {"dtype": "smallint", "char_size": None}}
+    })
+    monkeypatch.setattr(schema_drift, "run_operation",
+                        lambda macro, args, logger: calls.append(args) or SimpleNamespace(returncode=0, stdout="", stderr=""))
+    column_type = {
+        "crm_sales_details": {"sls_ord_num": "VARCHAR(20)", "sls_cust_id": "SMALLINT", "sls_order_dt": "DATE",
+                              "sls_price": "DECIMAL(10,2)"},
+        "crm_cust_info": {"cst_id": "INT"}
+    }
+
+    outcome = schema_drift.check_schema_drift(column_type, "bronze", logging.getLogger("test"),
+                                              allow_incompatible=allow_incompatible)
+
+    assert outcome["status"] == status
+    assert outcome["incompatible"] == incompatible
+    # The ALTERs of the compatible tables are applied either way.
+    assert outcome["applied"]
+    assert "ALTER TABLE bronze.crm_cust_info ALTER COLUMN cst_id INT NULL" in calls[0]["statements"][0]
+
+
+def test_indexes_on_altered_columns_are_dropped_before_the_alter(monkeypatch):
+    calls = []
+    monkeypatch.setattr(schema_drift, "describe_tables", lambda table_names, schema, logger: {
+        "crm_cust_info": {"cst_id": {"dtype": "smallint", "char_size": None}}
+    })
+    monkeypatch.setattr(schema_drift, "run_operation",
+                        lambda macro, args, logger: calls.append(args) or SimpleNamespace(returncode=0, stdout="", stderr=""))
+
+    schema_drift.check_schema_drift({"crm_cust_info": {"cst_id": "INT", "cst_key": "VARCHAR(10)"}}, "bronze",
+                                    logging.getLogger("test"))
+
+    batch = calls[0]["statements"][0]
+    assert "c.name IN ('cst_id')" in batch
+    assert batch.index("DROP INDEX") < batch.index("ALTER TABLE bronze.crm_cust_info ALTER COLUMN cst_id INT NULL")
@@ -0,0 +1,75 @@
+import pandas as pd
+
+from type_inference import ColumnStats, load_rules, resolve_column_type
+
+CONFIG = {
+    "exact": {"CST_KEY": "NVARCHAR(50)"},
+    "patterns": {"*_id": "INT"},
+    "dtypes": {"object": "NVARCHAR(50)", "int64": "BIGINT", "float64": "FLOAT"},
+    "inference": {"detect_dates": True, "date_min_ratio": 1.0, "right_size_integers": True,
+                  "right_size_strings": True, "string_headroom": 1.0}
+}
+
+
+def _stats(values: list) -> ColumnStats:
+    stats = ColumnStats()
+    stats.update(pd.Series(values))
+    return stats
+
+
+def _type(column: str, values: list, config: dict = CONFIG, complete: bool = True) -> str:
+    return resolve_column_type(column, _stats(values), load_rules(config), complete=complete)[0]
+
+
+def test_exact_name_wins_over_pattern_and_inference():
+    rules = load_rules(dict(CONFIG, patterns={"cst_*": "INT"}))
+
+    sql_type, reason = resolve_column_type("cst_key", _stats(["AW00011000"]), rules)
+
+    assert sql_type == "NVARCHAR(50)"
+    assert reason == "exact name match 'cst_key'"
+
+
+def test_pattern_wins_over_inference():
+    assert _type("sls_cust_id", [1, 2, 3]) == "INT"
+
+
+def test_inference_detects_dates_and_right_sizes():
+    assert _type("sls_order_dt", [20101229, 20110101]) == "DATE"
+    assert _type("order_date", ["2010-12-29", "2011-01-01"]) == "DATE"
+    assert _type("sls_quantity", [1, 200]) == "TINYINT"
+    assert _type("sls_price", [-5, 40000]) == "INT"
+    assert _type("cst_gndr", ["M", "F"]) == "VARCHAR(1)"
+    assert _type("cst_lastname", ["Müller", "Li"]) == "NVARCHAR(6)"
+
+
+def test_dtype_is_the_fallback():
+    assert _type("sls_sales", [1.5, 2.25]) == "FLOAT"
+    assert _type("sls_empty", [float("nan"), float("nan")]) == "FLOAT"
+    assert _type("cst_empty", [None, None]) == "NVARCHAR(50)"
+
+
+def test_sampled_statistics_do_not_shrink_widths():
+    # Values past the sample may be wider: keep the dtype type.
+    assert _type("sls_quantity", [1, 200], complete=False) == "BIGINT"
+    assert _type("cst_gndr", ["M", "F"], complete=False) == "NVARCHAR(50)"
+    assert _type("sls_order_dt", [20101229, 20110101], complete=False) == "DATE"
+
+
+def test_inference_switches():
+    config = dict(CONFIG, inference={"detect_dates": False, "right_size_integers": False, "right_size_strings": False})
+
+    assert _type("sls_order_dt", [20101229], config) == "BIGINT"
+    assert _type("cst_gndr", ["M"], config) == "NVARCHAR(50)"
+
+
+def test_legacy_flat_format_uses_substring_rules_without_inference():
+    legacy = {"_id": "INT", "date": "DATE", "object": "NVARCHAR(50)", "int64": "INT"}
+    rules = load_rules(legacy)
+
+    assert rules["patterns"] == {"*_id*": "INT", "*date*": "DATE"}
+    assert rules["dtypes"] == {"object": "NVARCHAR(50)", "int64": "INT"}
+    assert _type("prd_id", [1], legacy) == "INT"
+    assert _type("prd_start_date", ["2010-01-01"], legacy) == "DATE"
+    assert _type("sls_quantity", [1, 2], legacy) == "INT"
+    assert _type("cst_gndr", ["M"], legacy) == "NVARCHAR(50)"
@@ -0,0 +1,63 @@
+import csv
+import json
+import logging
+
+from validation import validate_csv
+
+COLUMNS = {"sls_ord_num": "VARCHAR(7)", "sls_cust_id": "SMALLINT", "sls_order_dt": "DATE", "sls_price": "DECIMAL(10,2)"}
+HEADER = "sls_ord_num,sls_cust_id,sls_order_dt,sls_price\n"
+
+
+def _validate(tmp_path, body: str, max_reject_ratio: float = 1.0) -> dict:
+    csv_path = tmp_path / "sales.csv"
+    csv_path.write_text(HEADER + body, encoding="utf-8")
+    return validate_csv("crm_sales_details", str(csv_path), COLUMNS, logging.getLogger("test"),
+                        output_path=str(tmp_path / "validated"), max_reject_ratio=max_reject_ratio)
+
+
+def _read(path: str) -> list:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_valid_rows_go_to_the_clean_file_and_rejects_to_quarantine(tmp_path):
+    report = _validate(tmp_path, "SO1,10,20101229,12.5\n"
+                                 "SO2,99999,2010-12-30,\n"
+                                 "SO3,11,2010-02-30,abc\n"
+                                 "SO4,12,,\n")
+
+    assert report["status"] == "VALID"
+    assert (report["rows"], report["rejected"]) == (4, 2)
+    assert report["reasons"] == {"sls_cust_id:OUT_OF_RANGE": 1, "sls_order_dt:INVALID_DATE": 1,
+                                 "sls_price:INVALID_NUMBER": 1}
+    # The clean file keeps the header (FIRSTROW = 2); empty values are NULLs and pass.
+    assert _read(report["clean_path"]) == [HEADER.strip().split(","), ["SO1", "10", "20101229", "12.5"],
+                                           ["SO4", "12", "", ""]]
+    assert _read(report["quarantine_path"])[1:] == [
+        ["3", "sls_cust_id:OUT_OF_RANGE", "SO2", "99999", "2010-12-30", ""],
+        ["4", "sls_order_dt:INVALID_DATE;sls_price:INVALID_NUMBER", "SO3", "11", "2010-02-30", "abc"]
+    ]
+    with open(tmp_path / "validated" / "crm_sales_details.validation.json", "r", encoding="utf-8") as f:
+        assert json.load(f)["rejected"] == 2
+
+
+def test_zero_encoded_dates_are_quarantined(tmp_path):
+    # The source writes a missing order date as 0, which is not a YYYYMMDD date.
+    report = _validate(tmp_path, "SO1,10,0,1\nSO2,10,20101229,1\n")
+
+    assert report["reasons"] == {"sls_order_dt:INVALID_DATE": 1}
+    assert [row[0] for row in _read(report["clean_path"])[1:]] == ["SO2"]
+
+
+def test_rows_with_a_wrong_field_count_are_rejected_as_column_count(tmp_path):
+    report = _validate(tmp_path, "SO1,10,20101229\nSO2,10,20101229,1,extra\nSO3,10,20101229,1\n")
+
+    assert report["reasons"] == {"COLUMN_COUNT": 2}
+    assert [row[1] for row in _read(report["quarantine_path"])[1:]] == ["COLUMN_COUNT", "COLUMN_COUNT"]
+
+
+def test_table_is_rejected_above_the_max_reject_ratio(tmp_path):
+    body = "SO1,10,0,1\nSO2,10,20101229,1\nSO3,10,20101229,1\nSO4,10,20101229,1\n"
+
+    assert _validate(tmp_path, body, max_reject_ratio=0.25)["status"] == "VALID"
+    assert _validate(tmp_path, body, max_reject_ratio=0.2)["status"] == "REJECTED"